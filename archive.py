@@ -0,0 +1,242 @@
+"""Archival of closed jobs, so the hot tables only hold open hiring.
+
+Closing a job stops new applications and drops it from candidate listings
+and recommendations. Archiving a closed job moves each of its applications,
+with its question scores and proctoring events, into archived_applications as
+one zlib-compressed JSON document, deletes the live rows (LSH buckets
+included) and moves report PDFs to REPORT_ARCHIVE_FOLDER. Archived
+applications stay readable through load_archived().
+"""
+import json
+import os
+import shutil
+import zlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, update
+
+from config import REPORT_ARCHIVE_FOLDER
+from extensions import db
+from live_updates import queue_job_refresh
+from models import (Admin, Application, ArchivedApplication, Candidate, Job, ProctoringEvent, QuestionScore,
+                    ResumeLshBucket)
+
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 200))
+PAYLOAD_VERSION = 1
+COMPRESSION_LEVEL = 6
+
+
+def pack(document):
+    return zlib.compress(json.dumps(document, separators=(',', ':')).encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def unpack(data):
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def close_job(job):
+    """Stop accepting applications for a job. The caller commits."""
+    if job.status == 'open':
+        job.status = 'closed'
+        job.closed_at = datetime.utcnow()
+
+
+def _document(application, scores, events):
+    return {
+        'version': PAYLOAD_VERSION,
+        'resume_text': application.resume_text,
+        'resume_digest': application.resume_digest,
+        'shortlist_reason': application.shortlist_reason,
+        'interview_questions': application.interview_questions,
+        'interview_results': application.results,
+        'scorecard': application.scorecard,
+        'completed_at': _iso(application.completed_at),
+        'duplicate_of_id': application.duplicate_of_id,
+        'question_scores': [{
+            'question_index': s.question_index, 'question': s.question, 'answer': s.answer,
+            'score': s.score, 'feedback': s.feedback, 'created_at': _iso(s.created_at),
+        } for s in scores],
+        'proctoring_events': [{
+            'event_type': e.event_type, 'question_index': e.question_index,
+            'occurred_at': _iso(e.occurred_at), 'received_at': _iso(e.received_at),
+        } for e in events],
+    }
+
+
+def _copy_report(path):
+    """Copy a report PDF into cold storage and return its new path (None if there is no file)."""
+    if not path or not os.path.exists(path):
+        return None
+    os.makedirs(REPORT_ARCHIVE_FOLDER, exist_ok=True)
+    target = os.path.join(REPORT_ARCHIVE_FOLDER, os.path.basename(path))
+    shutil.copy2(path, target)
+    return target
+
+
+def _archive_batch(job_id, admin_id, archived_at):
+    applications = Application.query.filter_by(job_id=job_id).order_by(Application.id).limit(ARCHIVE_BATCH_SIZE).all()
+    if not applications:
+        return 0, 0
+    ids = [application.id for application in applications]
+    scores, events = {}, {}
+    for score in QuestionScore.query.filter(QuestionScore.application_id.in_(ids)).order_by(
+            QuestionScore.application_id, QuestionScore.question_index):
+        scores.setdefault(score.application_id, []).append(score)
+    for event in ProctoringEvent.query.filter(ProctoringEvent.application_id.in_(ids)).order_by(
+            ProctoringEvent.application_id, ProctoringEvent.occurred_at):
+        events.setdefault(event.application_id, []).append(event)
+
+    rows, moved = [], []
+    for application in applications:
+        report_path = application.report_path
+        archived_path = _copy_report(report_path)
+        if archived_path:
+            moved.append(report_path)
+        rows.append({
+            'id': application.id,
+            'job_id': application.job_id,
+            'candidate_id': application.candidate_id,
+            'status': application.status,
+            'recommendation': application.recommendation,
+            'report_path': archived_path or report_path,
+            'archived_at': archived_at,
+            'payload': pack(_document(application, scores.get(application.id, []), events.get(application.id, []))),
+        })
+
+    db.session.execute(insert(ArchivedApplication), rows)
+    # Dependents are removed explicitly rather than relying on ON DELETE CASCADE (SQLite ignores it by default)
+    for model in (QuestionScore, ProctoringEvent, ResumeLshBucket):
+        db.session.execute(delete(model).where(model.application_id.in_(ids)))
+    db.session.execute(update(Application).where(Application.duplicate_of_id.in_(ids)).values(duplicate_of_id=None),
+                       execution_options={'synchronize_session': False})
+    db.session.execute(delete(Application).where(Application.id.in_(ids)),
+                       execution_options={'synchronize_session': False})
+    queue_job_refresh(db.session, admin_id, job_id)
+    db.session.commit()
+    db.session.expunge_all()
+
+    # Originals are removed only once the archive rows are committed
+    for path in moved:
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"ARCHIVE: could not remove {path} after archiving: {e}")
+    return len(ids), len(moved)
+
+
+def archive_job(job_id, progress=None):
+    """Move every application of a closed job into the archive; safe to re-run after a crash.
+
+    Returns (applications archived, report PDFs moved). progress, if given, is
+    called with the running totals after every batch.
+    """
+    job = db.session.get(Job, job_id)
+    if job is None:
+        raise ValueError(f'Job {job_id} not found.')
+    if job.status == 'open':
+        raise ValueError('Close the job before archiving it.')
+    admin_id = job.admin_id
+    db.session.commit()
+
+    archived_at = datetime.utcnow()
+    archived = moved = 0
+    while True:
+        batch, batch_moved = _archive_batch(job_id, admin_id, archived_at)
+        if not batch:
+            break
+        archived += batch
+        moved += batch_moved
+        if progress is not None:
+            progress(archived, moved)
+
+    db.session.execute(update(Job).where(Job.id == job_id).values(status='archived', archived_at=archived_at))
+    queue_job_refresh(db.session, admin_id, job_id)
+    db.session.commit()
+    return archived, moved
+
+
+def archive_closed_jobs(closed_days=0):
+    """Archive every job closed at least closed_days ago. Returns {job_id: applications archived}."""
+    cutoff = datetime.utcnow() - timedelta(days=closed_days)
+    job_ids = [row.id for row in db.session.query(Job.id).filter(Job.status == 'closed', Job.closed_at <= cutoff)]
+    db.session.commit()
+    return {job_id: archive_job(job_id)[0] for job_id in job_ids}
+
+
+def archived_counts(job_ids):
+    """{job_id: number of archived applications} for the given jobs."""
+    if not job_ids:
+        return {}
+    return dict(db.session.query(ArchivedApplication.job_id, func.count(ArchivedApplication.id)).filter(
+        ArchivedApplication.job_id.in_(job_ids)).group_by(ArchivedApplication.job_id).all())
+
+
+def list_archived(job_id, page=1, per_page=50):
+    """One page of a job's archived applications (summary columns only; payloads stay compressed)."""
+    per_page = max(1, min(per_page, 200))
+    page = max(1, page)
+    query = db.session.query(
+        ArchivedApplication.id, ArchivedApplication.status, ArchivedApplication.recommendation,
+        ArchivedApplication.report_path, ArchivedApplication.archived_at, Candidate.name, Candidate.email
+    ).join(Candidate, Candidate.id == ArchivedApplication.candidate_id).filter(ArchivedApplication.job_id == job_id)
+    total = query.count()
+    rows = query.order_by(ArchivedApplication.id).limit(per_page).offset((page - 1) * per_page).all()
+    return {
+        'job_id': job_id,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'applications': [{
+            'id': row.id,
+            'status': row.status,
+            'recommendation': row.recommendation,
+            'report_path': row.report_path,
+            'archived_at': _iso(row.archived_at),
+            'name': row.name,
+            'email': row.email,
+        } for row in rows],
+    }
+
+
+def load_archived(application_id, admin_id):
+    """Full archived application (decompressed) if it belongs to one of admin_id's jobs, else None."""
+    row = db.session.query(ArchivedApplication, Job.title, Candidate.name, Candidate.email).join(
+        Job, Job.id == ArchivedApplication.job_id).join(
+        Candidate, Candidate.id == ArchivedApplication.candidate_id).filter(
+        ArchivedApplication.id == application_id, Job.admin_id == admin_id).first()
+    if row is None:
+        return None
+    archived, title, name, email = row
+    return {
+        'id': archived.id,
+        'job_id': archived.job_id,
+        'job_title': title,
+        'candidate_id': archived.candidate_id,
+        'name': name,
+        'email': email,
+        'status': archived.status,
+        'recommendation': archived.recommendation,
+        'report_path': archived.report_path,
+        'archived_at': _iso(archived.archived_at),
+        **unpack(archived.payload),
+    }
+
+
+def candidate_archived_applications(candidate_id):
+    """A candidate's archived applications in the shape of /api/candidate/applications."""
+    rows = db.session.query(
+        ArchivedApplication.id, ArchivedApplication.status, ArchivedApplication.report_path,
+        Job.title, Admin.company_name
+    ).join(Job, Job.id == ArchivedApplication.job_id).join(Admin, Admin.id == Job.admin_id).filter(
+        ArchivedApplication.candidate_id == candidate_id).order_by(ArchivedApplication.id.desc()).all()
+    return [{
+        'id': row.id,
+        'status': row.status,
+        'report_path': row.report_path,
+        'title': row.title,
+        'company_name': row.company_name,
+    } for row in rows]
@@ -0,0 +1,67 @@
+"""Compare two benchmark result files and flag regressions.
+
+Works on the JSON written by load.py and micro.py. A scenario (or endpoint)
+regresses when its p95 latency grows, or its throughput drops, by more than
+--threshold percent. Exits 1 if anything regressed.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+
+
+def _rows(report):
+    for name, summary in report.get('scenarios', {}).items():
+        if 'p95_ms' not in summary:
+            continue
+        yield name, summary
+        for endpoint, endpoint_summary in summary.get('by_endpoint', {}).items():
+            yield f"{name} :: {endpoint}", endpoint_summary
+
+
+def _change(old, new):
+    if not old:
+        return None
+    return (new - old) / old * 100.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed change in percent')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = dict(_rows(json.load(f)))
+    with open(args.candidate) as f:
+        candidate = dict(_rows(json.load(f)))
+
+    regressions = []
+    print(f"{'scenario':60} {'p95 base':>10} {'p95 new':>10} {'Δp95':>8} {'Δrps':>8}")
+    for name, new in candidate.items():
+        old = baseline.get(name)
+        if not old:
+            print(f"{name:60} {'-':>10} {new['p95_ms']:>10.1f}   (new)")
+            continue
+        p95_change = _change(old['p95_ms'], new['p95_ms'])
+        rps_change = _change(old.get('throughput_rps'), new.get('throughput_rps') or 0.0)
+        regressed = (p95_change is not None and p95_change > args.threshold) or \
+                    (rps_change is not None and rps_change < -args.threshold)
+        if regressed:
+            regressions.append(name)
+        p95_text = f"{p95_change:+.1f}%" if p95_change is not None else 'n/a'
+        rps_text = f"{rps_change:+.1f}%" if rps_change is not None else 'n/a'
+        print(f"{name:60} {old['p95_ms']:>10.1f} {new['p95_ms']:>10.1f} {p95_text:>8} {rps_text:>8}"
+              f"{'  REGRESSION' if regressed else ''}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0f}%.")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Stand-ins for the external services the app talks to.
+
+- FakeModel: answers every prompt the app sends to Gemini with well-formed
+  JSON after a configurable latency.
+- SmtpSink: a local SMTP server that accepts AUTH and swallows messages.
+
+PostgreSQL is stood in for by SQLite (see config.load_config).
+"""
+import json
+import random
+import socketserver
+import threading
+import time
+from collections import Counter
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Drop-in for genai.GenerativeModel used through llm.set_model()."""
+
+    def __init__(self, latency_ms=800, jitter_ms=200, shortlist_rate=0.5, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.shortlist_rate = shortlist_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = Counter()
+
+    def _sleep(self):
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000.0)
+
+    def _respond(self, prompt):
+        with self._lock:
+            roll = self._random.random()
+            score = self._random.randint(3, 10)
+        if 'good fit for the job description' in prompt:
+            kind = 'shortlist'
+            payload = {'shortlisted': roll < self.shortlist_rate, 'reason': 'Synthetic verdict.'}
+        elif 'interview questions' in prompt:
+            kind = 'questions'
+            payload = {'questions': [f'Synthetic question {i + 1}?' for i in range(5)]}
+        elif 'conversational tone' in prompt:
+            kind = 'casual'
+            payload = {'casual_question': 'So, tell me about that?'}
+        elif 'evaluate the following answer' in prompt:
+            kind = 'score'
+            payload = {'score': score, 'feedback': 'Synthetic feedback.'}
+        elif 'senior hiring manager' in prompt:
+            kind = 'scorecard'
+            payload = {
+                'overall_summary': 'Synthetic summary of the interview.',
+                'strengths': ['Communication', 'Problem solving'],
+                'areas_for_improvement': ['Depth in system design'],
+                'final_recommendation': 'Consider',
+            }
+        else:
+            kind = 'other'
+            payload = {}
+        with self._lock:
+            self.calls[kind] += 1
+        return json.dumps(payload)
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self._sleep()
+        text = self._respond(prompt)
+        if stream:
+            # Emit the response in a few chunks like the SDK's streamed generation
+            size = max(1, len(text) // 4)
+            return iter([FakeResponse(text[i:i + size]) for i in range(0, len(text), size)])
+        return FakeResponse(text)
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self._reply('220 smtp-sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.wfile.write(b'250-smtp-sink\r\n250-AUTH PLAIN LOGIN\r\n250 OK\r\n')
+            elif verb == 'AUTH':
+                if command.upper().startswith('AUTH LOGIN'):
+                    if len(command.split()) < 3:
+                        self._reply('334 VXNlcm5hbWU6')
+                        self.rfile.readline()
+                    self._reply('334 UGFzc3dvcmQ6')
+                    self.rfile.readline()
+                self._reply('235 Authentication successful')
+            elif verb == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                self.server.sink.record()
+                self._reply('250 OK queued')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP ...
+                self._reply('250 OK')
+
+
+class SmtpSink:
+    """Local SMTP server that accepts everything and counts delivered messages."""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self._server = socketserver.ThreadingTCPServer((host, port), _SmtpHandler)
+        self._server.daemon_threads = True
+        self._server.sink = self
+        self.host, self.port = self._server.server_address
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def record(self):
+        with self._lock:
+            self.delivered += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
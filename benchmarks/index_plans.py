@@ -0,0 +1,174 @@
+"""Query-plan benchmark for the applications access paths.
+
+Seeds an isolated schema with a synthetic dataset (1M applications by default),
+then runs EXPLAIN ANALYZE for the shortlisting and bulk-invite filters twice:
+once with only the original single-column indexes and once with the composite
+and partial indexes from the models. Plans and timings are printed and written
+as JSON.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/index_plans.py \
+        --applications 1000000 --jobs 2000 --output bench_index_plans.json
+
+The benchmark only touches the `bench_indexes` schema, which it drops at the end.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+SCHEMA = 'bench_indexes'
+
+SETUP = [
+    f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE",
+    f"CREATE SCHEMA {SCHEMA}",
+    f"""CREATE TABLE {SCHEMA}.applications (
+        id serial PRIMARY KEY,
+        candidate_id integer NOT NULL,
+        job_id integer NOT NULL,
+        resume_text text NOT NULL,
+        status varchar(50) NOT NULL DEFAULT 'Applied',
+        shortlist_reason text,
+        report_path varchar(500),
+        interview_results text,
+        interview_data jsonb
+    )""",
+]
+
+# Status mix roughly matching a mature tenant: most rows are finished.
+SEED = f"""
+INSERT INTO {SCHEMA}.applications (candidate_id, job_id, resume_text, status, interview_results)
+SELECT g,
+       1 + (g % :jobs),
+       repeat('resume text ', 40),
+       CASE
+           WHEN g % 100 < 3 THEN 'Applied'
+           WHEN g % 100 < 5 THEN 'Shortlisted'
+           WHEN g % 100 < 20 THEN 'Invited'
+           WHEN g % 100 < 60 THEN 'Completed'
+           ELSE 'Rejected'
+       END,
+       CASE WHEN g % 100 BETWEEN 20 AND 59
+            THEN '[{{"question": "q", "answer": "a", "score": ' || (g % 11) || '}}]'
+       END
+FROM generate_series(1, :applications) AS g
+"""
+
+ORIGINAL_INDEXES = [
+    f"CREATE INDEX ON {SCHEMA}.applications (candidate_id)",
+    f"CREATE INDEX ON {SCHEMA}.applications (job_id)",
+    f"CREATE INDEX ON {SCHEMA}.applications (status)",
+]
+
+NEW_INDEXES = [
+    f"CREATE INDEX ix_bench_job_status ON {SCHEMA}.applications (job_id, status)",
+    f"CREATE INDEX ix_bench_job_applied ON {SCHEMA}.applications (job_id) WHERE status = 'Applied'",
+    f"CREATE INDEX ix_bench_job_shortlisted ON {SCHEMA}.applications (job_id) WHERE status = 'Shortlisted'",
+    f"UPDATE {SCHEMA}.applications SET interview_data = interview_results::jsonb WHERE interview_results IS NOT NULL",
+    f"CREATE INDEX ix_bench_interview_data ON {SCHEMA}.applications USING gin (interview_data jsonb_path_ops)",
+]
+
+QUERIES = {
+    'shortlist_applied': f"SELECT * FROM {SCHEMA}.applications WHERE job_id = :job_id AND status = 'Applied'",
+    'bulk_invite_shortlisted': f"SELECT * FROM {SCHEMA}.applications WHERE job_id = :job_id AND status = 'Shortlisted'",
+    'dashboard_job_status_counts': f"SELECT status, count(*) FROM {SCHEMA}.applications WHERE job_id = :job_id GROUP BY status",
+    'results_with_perfect_score': f"SELECT id FROM {SCHEMA}.applications WHERE interview_data @> '[{{\"score\": 10}}]'",
+}
+
+
+def explain(conn, sql, params):
+    rows = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+    plan = rows[0] if isinstance(rows, list) else json.loads(rows)[0]
+    return plan
+
+
+def run_queries(conn, job_ids, repeat):
+    results = {}
+    for name, sql in QUERIES.items():
+        if 'interview_data' in sql and not conn.execute(text(
+                f"SELECT 1 FROM {SCHEMA}.applications WHERE interview_data IS NOT NULL LIMIT 1")).first():
+            continue
+        timings = []
+        plan = None
+        for job_id in job_ids[:repeat]:
+            plan = explain(conn, sql, {'job_id': job_id})
+            timings.append(plan['Execution Time'])
+        results[name] = {
+            'median_ms': statistics.median(timings),
+            'max_ms': max(timings),
+            'node_type': plan['Plan']['Node Type'],
+            'index_name': plan['Plan'].get('Index Name'),
+            'plan': plan['Plan'],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--applications', type=int, default=1_000_000)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20, help='number of job ids sampled per query')
+    parser.add_argument('--output', default='bench_index_plans.json')
+    parser.add_argument('--keep', action='store_true', help='keep the bench schema after running')
+    args = parser.parse_args()
+
+    url = os.getenv('BENCH_DATABASE_URL') or os.getenv('DATABASE_URL')
+    if not url:
+        raise SystemExit('Set BENCH_DATABASE_URL (or DATABASE_URL) to a PostgreSQL database.')
+    if url.startswith('postgres://'):
+        url = url.replace('postgres://', 'postgresql://', 1)
+    engine = create_engine(url)
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for statement in SETUP:
+            conn.execute(text(statement))
+        start = time.perf_counter()
+        conn.execute(text(SEED), {'applications': args.applications, 'jobs': args.jobs})
+        for statement in ORIGINAL_INDEXES:
+            conn.execute(text(statement))
+        conn.execute(text(f"ANALYZE {SCHEMA}.applications"))
+        print(f"Seeded {args.applications} applications in {time.perf_counter() - start:.1f}s")
+
+        job_ids = list(range(1, args.jobs + 1, max(1, args.jobs // args.repeat)))
+        before = run_queries(conn, job_ids, args.repeat)
+
+        start = time.perf_counter()
+        for statement in NEW_INDEXES:
+            conn.execute(text(statement))
+        conn.execute(text(f"ANALYZE {SCHEMA}.applications"))
+        index_build_s = time.perf_counter() - start
+
+        after = run_queries(conn, job_ids, args.repeat)
+        sizes = dict(conn.execute(text(
+            "SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes WHERE schemaname = :schema"
+        ), {'schema': SCHEMA}).all())
+
+        if not args.keep:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    report = {
+        'applications': args.applications,
+        'jobs': args.jobs,
+        'index_build_seconds': index_build_s,
+        'index_sizes_bytes': sizes,
+        'before': before,
+        'after': after,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'query':32} {'before (ms)':>12} {'after (ms)':>12}  plan after")
+    for name in QUERIES:
+        b, a = before.get(name), after.get(name)
+        if not a:
+            continue
+        before_ms = f"{b['median_ms']:.2f}" if b else 'n/a'
+        print(f"{name:32} {before_ms:>12} {a['median_ms']:>12.2f}  {a['node_type']} {a['index_name'] or ''}")
+    print(f"Full plans written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
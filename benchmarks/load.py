@@ -0,0 +1,300 @@
+"""Scenario-driven load test with fake Gemini, SMTP and PostgreSQL stand-ins.
+
+Everything runs in-process: the app is built with create_app() against a
+throwaway SQLite database (or BENCH_DATABASE_URL), Gemini is replaced by a
+latency-configurable FakeModel and email goes to a local SMTP sink. Simulated
+users each get their own test client (and therefore their own session).
+
+Scenarios:
+    dashboard       admins load /api/admin/jobs, candidates load /api/jobs
+                    and /api/candidate/applications
+    interview       full interview: start, per question make_casual +
+                    score_answer, a proctoring batch, final report
+    shortlisting    admins shortlist their jobs' Applied candidates
+    bulk_invites    the RQ task sending invites for every shortlisted candidate
+
+Usage:
+    python benchmarks/load.py --scenarios dashboard,interview \
+        --concurrency 20 --iterations 50 --llm-latency-ms 800 \
+        --output bench_load.json
+
+Compare two result files with benchmarks/compare.py.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fakes import FakeModel, SmtpSink
+from seed import SEED_PASSWORD, seed
+
+
+class Recorder:
+    """Thread-safe collector of per-endpoint latencies."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def call(self, endpoint, fn):
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = fn()
+            ok = response is None or getattr(response, 'status_code', 200) < 400
+            return response
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000.0
+            with self._lock:
+                self.samples[endpoint].append(elapsed)
+                if not ok:
+                    self.errors[endpoint] += 1
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(recorder, wall_seconds):
+    by_endpoint = {}
+    all_samples = []
+    for endpoint, values in recorder.samples.items():
+        all_samples.extend(values)
+        by_endpoint[endpoint] = {
+            'requests': len(values),
+            'errors': recorder.errors.get(endpoint, 0),
+            'p50_ms': _percentile(values, 50),
+            'p95_ms': _percentile(values, 95),
+            'p99_ms': _percentile(values, 99),
+            'mean_ms': statistics.fmean(values),
+            'max_ms': max(values),
+        }
+    total = len(all_samples)
+    return {
+        'requests': total,
+        'errors': sum(recorder.errors.values()),
+        'wall_seconds': wall_seconds,
+        'throughput_rps': total / wall_seconds if wall_seconds else 0.0,
+        'p50_ms': _percentile(all_samples, 50) if all_samples else None,
+        'p95_ms': _percentile(all_samples, 95) if all_samples else None,
+        'by_endpoint': by_endpoint,
+    }
+
+
+def _login(client, user_type, email):
+    response = client.post(f'/api/login/{user_type}', json={'email': email, 'password': SEED_PASSWORD})
+    if response.status_code != 200:
+        raise RuntimeError(f'login failed for {email}: {response.status_code}')
+
+
+def _run_users(count, concurrency, fn):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(fn, i) for i in range(count)]:
+            future.result()
+    return time.perf_counter() - start
+
+
+# --- Scenarios ---
+def scenario_dashboard(ctx, args):
+    recorder = Recorder()
+    app, data = ctx['app'], ctx['data']
+
+    def user(i):
+        client = app.test_client()
+        if i % 2 == 0:
+            _login(client, 'admin', data['admin_emails'][i % len(data['admin_emails'])])
+            for _ in range(args.requests_per_user):
+                recorder.call('GET /api/admin/jobs', lambda: client.get('/api/admin/jobs'))
+        else:
+            _login(client, 'candidate', data['candidate_emails'][i % len(data['candidate_emails'])])
+            for _ in range(args.requests_per_user):
+                recorder.call('GET /api/jobs', lambda: client.get('/api/jobs'))
+                recorder.call('GET /api/candidate/applications', lambda: client.get('/api/candidate/applications'))
+
+    return summarize(recorder, _run_users(args.iterations, args.concurrency, user))
+
+
+def scenario_interview(ctx, args):
+    from extensions import db
+    from models import Application
+
+    recorder = Recorder()
+    app = ctx['app']
+    with app.app_context():
+        ids = [row.id for row in db.session.query(Application.id).filter(
+            Application.status.in_(['Invited', 'Shortlisted'])).limit(args.iterations)]
+    if not ids:
+        return {'skipped': 'no Invited/Shortlisted applications seeded'}
+
+    def user(i):
+        application_id = ids[i % len(ids)]
+        client = app.test_client()
+        response = recorder.call('POST /api/start_interview', lambda: client.post(
+            '/api/start_interview', json={'application_id': application_id}))
+        questions = response.get_json().get('questions', [])
+        for index, question in enumerate(questions):
+            recorder.call('POST /api/make_casual', lambda: client.post('/api/make_casual', json={'question': question}))
+            answer = f'Synthetic answer number {index} with enough detail to be scored.'
+            recorder.call('POST /api/score_answer', lambda: client.post(
+                '/api/score_answer', json={'question': question, 'answer': answer, 'question_index': index}))
+        now_ms = time.time() * 1000
+        recorder.call('POST /api/proctor/events', lambda: client.post('/api/proctor/events', json={'events': [
+            {'type': 'focus_loss', 'ts': now_ms - 5000, 'question_index': 0},
+            {'type': 'multi_face', 'ts': now_ms - 2000, 'question_index': 1},
+        ]}))
+        recorder.call('POST /api/generate_final_report', lambda: client.post(
+            '/api/generate_final_report', json={'application_id': application_id}))
+
+    return summarize(recorder, _run_users(len(ids), args.concurrency, user))
+
+
+def scenario_shortlisting(ctx, args):
+    recorder = Recorder()
+    app, data = ctx['app'], ctx['data']
+    admins = data['admin_emails']
+
+    def user(i):
+        from extensions import db
+        from models import Admin, Job
+        client = app.test_client()
+        email = admins[i % len(admins)]
+        _login(client, 'admin', email)
+        with app.app_context():
+            job_ids = [row.id for row in db.session.query(Job.id).join(Admin).filter(Admin.email == email)]
+        for job_id in job_ids:
+            recorder.call('POST /api/admin/shortlist/<job_id>',
+                          lambda: client.post(f'/api/admin/shortlist/{job_id}'))
+
+    return summarize(recorder, _run_users(len(admins), args.concurrency, user))
+
+
+def scenario_bulk_invites(ctx, args):
+    import tasks
+
+    recorder = Recorder()
+    sink = ctx['smtp']
+    before = sink.delivered
+    job_ids = ctx['data']['job_ids']
+
+    def user(i):
+        recorder.call('task send_bulk_invites', lambda: tasks.send_bulk_invites(job_ids[i]))
+
+    result = summarize(recorder, _run_users(len(job_ids), args.concurrency, user))
+    result['emails_delivered'] = sink.delivered - before
+    return result
+
+
+SCENARIOS = {
+    'dashboard': scenario_dashboard,
+    'interview': scenario_interview,
+    'shortlisting': scenario_shortlisting,
+    'bulk_invites': scenario_bulk_invites,
+}
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20, help='simulated users per scenario')
+    parser.add_argument('--requests-per-user', type=int, default=10)
+    parser.add_argument('--llm-latency-ms', type=float, default=800)
+    parser.add_argument('--llm-jitter-ms', type=float, default=200)
+    parser.add_argument('--llm-rpm', type=float, default=0,
+                        help='model calls per minute for the LLM scheduler (0 = unlimited)')
+    parser.add_argument('--admins', type=int, default=5)
+    parser.add_argument('--jobs-per-admin', type=int, default=5)
+    parser.add_argument('--candidates', type=int, default=500)
+    parser.add_argument('--applications-per-job', type=int, default=40)
+    parser.add_argument('--output', default='bench_load.json')
+    parser.add_argument('--keep-redis', action='store_true', help='use REDIS_URL if set (cache, sessions)')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    workdir = tempfile.mkdtemp(prefix='bench_load_')
+    sink = SmtpSink().start()
+    os.environ.setdefault('FLASK_SECRET_KEY', 'benchmark')
+    os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL') or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.update({
+        'GMAIL_USER': 'bench@bench.example', 'GMAIL_APP_PASSWORD': 'bench',
+        'SMTP_HOST': sink.host, 'SMTP_PORT': str(sink.port), 'SMTP_USE_SSL': 'false',
+    })
+    if not args.keep_redis:
+        os.environ.pop('REDIS_URL', None)
+    os.environ['LLM_REQUESTS_PER_MINUTE'] = str(args.llm_rpm)
+    # Reports are written relative to the working directory
+    os.chdir(workdir)
+
+    import llm
+    from app import create_app
+    from extensions import db
+    from schema import init_db
+
+    model = FakeModel(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms)
+    llm.set_model(model)
+    app = create_app()
+    with app.app_context():
+        init_db(db, retries=1)
+        data = seed(args.admins, args.jobs_per_admin, args.candidates, args.applications_per_job)
+    print(f"Seeded {data['applications']} applications across {data['jobs']} jobs in {data['seconds']:.1f}s")
+
+    # The worker path builds its own app; share ours so it uses the same database
+    import tasks
+    tasks._app = app
+
+    ctx = {'app': app, 'data': data, 'smtp': sink}
+    results = {}
+    for name in [n.strip() for n in args.scenarios.split(',') if n.strip()]:
+        print(f"Running scenario {name}...")
+        results[name] = SCENARIOS[name](ctx, args)
+        summary = results[name]
+        if 'requests' in summary:
+            print(f"  {summary['requests']} requests, {summary['errors']} errors, "
+                  f"{summary['throughput_rps']:.1f} req/s, p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms")
+        else:
+            print(f"  {summary}")
+
+    report = {
+        'meta': {
+            'kind': 'load',
+            'git_revision': _git_revision(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'database': os.environ['DATABASE_URL'].split(':', 1)[0],
+            'config': {k: v for k, v in vars(args).items() if k != 'output'},
+            'seeded': {k: data[k] for k in ('admins', 'jobs', 'candidates', 'applications')},
+            'llm_calls': dict(model.calls),
+        },
+        'scenarios': results,
+    }
+    sink.stop()
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Micro-benchmarks for CPU-bound helpers.
+
+    extract_pdf     resume_parsing.extract_resume_text on a generated PDF
+    extract_docx    resume_parsing.extract_resume_text on a generated DOCX
+    render_report   reports.render_report_pdf for a typical scorecard
+
+Usage:
+    python benchmarks/micro.py [--repeat 30] [--pages 3] [--output bench_micro.json]
+
+Output uses the same layout as benchmarks/load.py, so compare.py works on both.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESUME_LINE = ("Senior backend engineer with 8 years of Python, Flask, PostgreSQL and Redis experience; "
+               "led a migration to containerised services on Kubernetes.")
+
+SCORECARD = {
+    'overall_summary': 'The candidate communicated clearly and showed solid fundamentals across all questions.',
+    'strengths': ['Clear communication', 'Strong Python fundamentals', 'Pragmatic system design'],
+    'areas_for_improvement': ['Depth in distributed systems', 'Testing strategy'],
+    'final_recommendation': 'Recommend',
+}
+FLAGS = ['Q1: Lack of focus', 'Q3: Multiple faces detected', 'Q4: Tab switch']
+
+
+def make_pdf(pages):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for _ in range(pages):
+        y = 740
+        while y > 60:
+            pdf.drawString(50, y, RESUME_LINE[:95])
+            y -= 14
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def make_docx(paragraphs):
+    import docx
+    document = docx.Document()
+    for _ in range(paragraphs):
+        document.add_paragraph(RESUME_LINE)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(fn, repeat, warmup=2):
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    ordered = sorted(timings)
+    return {
+        'requests': repeat,
+        'errors': 0,
+        'p50_ms': statistics.median(timings),
+        'p95_ms': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        'mean_ms': statistics.fmean(timings),
+        'max_ms': max(timings),
+        'throughput_rps': 1000.0 / statistics.fmean(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--pages', type=int, default=3, help='pages in the sample PDF resume')
+    parser.add_argument('--output', default='bench_micro.json')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    from reports import render_report_pdf
+    from resume_parsing import extract_resume_text
+
+    pdf_bytes = make_pdf(args.pages)
+    docx_bytes = make_docx(args.pages * 50)
+
+    results = {
+        'extract_pdf': measure(lambda: extract_resume_text('resume.pdf', pdf_bytes), args.repeat),
+        'extract_docx': measure(lambda: extract_resume_text('resume.docx', docx_bytes), args.repeat),
+        'render_report': measure(lambda: render_report_pdf(SCORECARD, FLAGS), args.repeat),
+    }
+    for name, summary in results.items():
+        print(f"{name:16} p50 {summary['p50_ms']:8.2f} ms  p95 {summary['p95_ms']:8.2f} ms  "
+              f"{summary['throughput_rps']:8.1f} ops/s")
+
+    try:
+        revision = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        revision = None
+    report = {
+        'meta': {
+            'kind': 'micro',
+            'git_revision': revision,
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'config': {'repeat': args.repeat, 'pages': args.pages},
+        },
+        'scenarios': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Serialization time and bytes on the wire for a large admin dashboard payload.
+
+Seeds one admin with --applications applications (10k by default) in a
+throwaway SQLite database, then measures:
+
+    serialize_json      Flask's default json-module provider
+    serialize_orjson    responses.OrjsonProvider
+    compress_gzip       gzip of the serialized payload
+    compress_br         brotli of the serialized payload (if installed)
+    get_admin_jobs_*    GET /api/admin/jobs end to end, per Accept-Encoding
+
+Every scenario also records the response size in bytes.
+
+Usage:
+    python benchmarks/payload.py [--applications 10000] [--repeat 20] [--output bench_payload.json]
+
+Output uses the same layout as load.py and micro.py, so compare.py works on it.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from micro import measure  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--applications', type=int, default=10000)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', default='bench_payload.json')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_payload_')
+    os.environ.setdefault('FLASK_SECRET_KEY', 'benchmark')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.pop('REDIS_URL', None)
+    # Measure the serialization, not the response cache
+    os.environ['CACHE_LOCAL_TTL'] = '0'
+
+    from flask.json.provider import DefaultJSONProvider
+
+    import responses
+    from app import create_app, load_admin_jobs
+    from extensions import db
+    from models import Admin
+    from schema import init_db
+    from seed import SEED_PASSWORD, seed
+
+    app = create_app()
+    per_job = max(1, args.applications // args.jobs)
+    with app.app_context():
+        init_db(db, retries=1)
+        seed(admins=1, jobs_per_admin=args.jobs, candidates=per_job, applications_per_job=per_job)
+        admin = Admin.query.order_by(Admin.id.desc()).first()
+        admin_id, email = admin.id, admin.email
+        payload = load_admin_jobs(admin_id)
+    applications = sum(len(job['applications']) for job in payload)
+    print(f"Payload: {len(payload)} jobs, {applications} applications")
+
+    results = {}
+
+    def record(name, fn, size):
+        results[name] = dict(measure(fn, args.repeat), bytes=size)
+        summary = results[name]
+        print(f"{name:28} p50 {summary['p50_ms']:8.2f} ms  p95 {summary['p95_ms']:8.2f} ms  {size:>10} bytes")
+
+    with app.app_context():
+        providers = {'json': DefaultJSONProvider(app)}
+        if responses.orjson is not None:
+            providers['orjson'] = responses.OrjsonProvider(app)
+        for name, provider in providers.items():
+            body = provider.response(payload).get_data()
+            record(f'serialize_{name}', lambda: provider.response(payload).get_data(), len(body))
+        body = app.json.response(payload).get_data()
+
+    encodings = ['gzip'] + (['br'] if responses.brotli is not None else [])
+    for encoding in encodings:
+        record(f'compress_{encoding}', lambda: responses.compress(body, encoding),
+               len(responses.compress(body, encoding)))
+
+    client = app.test_client()
+    client.post('/api/login/admin', json={'email': email, 'password': SEED_PASSWORD})
+    for encoding in ['identity'] + encodings:
+        headers = {'Accept-Encoding': encoding}
+        size = len(client.get('/api/admin/jobs', headers=headers).get_data())
+        record(f'get_admin_jobs_{encoding}', lambda: client.get('/api/admin/jobs', headers=headers).get_data(), size)
+
+    try:
+        revision = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        revision = None
+    report = {
+        'meta': {
+            'kind': 'payload',
+            'git_revision': revision,
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'config': {'applications': applications, 'jobs': args.jobs, 'repeat': args.repeat},
+        },
+        'scenarios': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
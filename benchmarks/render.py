@@ -0,0 +1,164 @@
+"""Report rendering throughput, in reports per second and per core.
+
+    render_rebuilt_styles   reports.render_report_pdf with the styles rebuilt for
+                            every report (what each report used to cost)
+    render_cached_styles    reports.render_report_pdf with the per-process styles
+    pool_<n>                --reports PDFs rendered across n worker processes
+    regenerate_<n>          reports.regenerate_reports end to end on n workers, over
+                            --reports completed interviews in a throwaway SQLite
+                            database (stored scorecards, so no model calls;
+                            worker start-up included)
+
+Pool scenarios run for 1 worker and for --workers (default: CPU count).
+reports_per_sec_per_core divides throughput by the workers used.
+
+Usage:
+    python benchmarks/render.py [--repeat 30] [--reports 200] [--workers N] [--output bench_render.json]
+
+Output uses the same layout as load.py and micro.py, so compare.py works on it.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from micro import FLAGS, SCORECARD, measure  # noqa: E402
+
+TRANSCRIPT = [{'question': f'Question {i + 1}?', 'answer': 'A considered answer. ' * 10, 'score': 7,
+               'feedback': 'Good.'} for i in range(5)]
+
+
+def _render_batch(count):
+    """Pool worker: render count reports, return each one's time in ms."""
+    import reports
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        reports.render_report_pdf(SCORECARD, FLAGS)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return timings
+
+
+def _summary(timings, seconds, total, workers):
+    ordered = sorted(timings)
+    throughput = total / seconds
+    summary = {
+        'requests': total,
+        'errors': 0,
+        'workers': workers,
+        'seconds': seconds,
+        'throughput_rps': throughput,
+        'reports_per_sec_per_core': throughput / workers,
+    }
+    if timings:
+        summary.update({
+            'p50_ms': statistics.median(timings),
+            'p95_ms': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+            'mean_ms': statistics.fmean(timings),
+            'max_ms': max(timings),
+        })
+    return summary
+
+
+def pool_render(total, workers):
+    batch = max(1, total // (workers * 4))
+    batches = [batch] * (total // batch) + ([total % batch] if total % batch else [])
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        # Warm every worker (imports, fonts, styles) before timing
+        list(pool.map(_render_batch, [1] * workers))
+        start = time.perf_counter()
+        timings = [t for chunk in pool.map(_render_batch, batches) for t in chunk]
+        seconds = time.perf_counter() - start
+    return _summary(timings, seconds, total, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--reports', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--output', default='bench_render.json')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    workdir = tempfile.mkdtemp(prefix='bench_render_')
+    os.chdir(workdir)  # regenerated PDFs land in ./reports
+    os.environ.setdefault('FLASK_SECRET_KEY', 'benchmark')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.pop('REDIS_URL', None)
+    os.environ.pop('GEMINI_API_KEY', None)
+
+    import reports
+
+    def rebuilt():
+        reports._layout = None
+        reports.render_report_pdf(SCORECARD, FLAGS)
+
+    results = {
+        'render_rebuilt_styles': measure(rebuilt, args.repeat),
+        'render_cached_styles': measure(lambda: reports.render_report_pdf(SCORECARD, FLAGS), args.repeat),
+    }
+    for name in results:
+        results[name]['reports_per_sec_per_core'] = results[name]['throughput_rps']
+
+    worker_counts = sorted({1, max(1, args.workers)})
+    for workers in worker_counts:
+        results[f'pool_{workers}'] = pool_render(args.reports, workers)
+
+    from app import create_app
+    from extensions import db
+    from models import Application
+    from schema import init_db
+    from seed import seed
+
+    app = create_app()
+    with app.app_context():
+        init_db(db, retries=1)
+        seed(admins=1, jobs_per_admin=1, candidates=args.reports, applications_per_job=args.reports,
+             status_mix={'Completed': 1.0})
+        db.session.query(Application).update({Application.scorecard: SCORECARD, Application.interview_data: TRANSCRIPT,
+                                              Application.completed_at: datetime.utcnow()})
+        db.session.commit()
+        for workers in worker_counts:
+            summary = reports.regenerate_reports(workers=workers)
+            results[f'regenerate_{workers}'] = _summary([], summary['seconds'], summary['total'], workers)
+
+    for name, summary in results.items():
+        latency = f"p50 {summary['p50_ms']:8.2f} ms  p95 {summary['p95_ms']:8.2f} ms" if 'p50_ms' in summary else ' ' * 32
+        print(f"{name:24} {latency}  {summary['throughput_rps']:8.1f} reports/s  "
+              f"{summary['reports_per_sec_per_core']:8.1f} reports/s/core")
+
+    try:
+        revision = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        revision = None
+    report = {
+        'meta': {
+            'kind': 'render',
+            'git_revision': revision,
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'config': {'repeat': args.repeat, 'reports': args.reports, 'workers': args.workers},
+        },
+        'scenarios': results,
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
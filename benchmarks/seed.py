@@ -0,0 +1,139 @@
+"""Synthetic data generator: admins, jobs, candidates and applications.
+
+Rows are written with bulk INSERTs in batches, so large datasets seed in
+seconds. Every seeded account uses the password SEED_PASSWORD.
+
+Usage (seeds the database in DATABASE_URL, creating tables if needed):
+    python benchmarks/seed.py --admins 10 --jobs-per-admin 20 \
+        --candidates 5000 --applications-per-job 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert
+from werkzeug.security import generate_password_hash
+
+from extensions import db
+from models import Admin, Candidate, Job, Application
+
+SEED_PASSWORD = 'benchmark'
+BATCH_SIZE = 5000
+
+# Default status mix for seeded applications
+STATUS_MIX = {
+    'Applied': 0.30,
+    'Shortlisted': 0.15,
+    'Invited': 0.15,
+    'Completed': 0.25,
+    'Rejected': 0.15,
+}
+
+SKILLS = ['Python', 'Flask', 'PostgreSQL', 'React', 'Docker', 'Kubernetes', 'AWS', 'Go', 'Java',
+          'TypeScript', 'Redis', 'Machine Learning', 'CI/CD', 'Terraform', 'GraphQL', 'Kafka']
+TITLES = ['Backend Developer', 'Frontend Developer', 'DevOps Engineer', 'Data Scientist',
+          'Platform Engineer', 'Full Stack Developer', 'ML Engineer', 'SRE']
+
+
+def _resume(rng, index):
+    skills = ', '.join(rng.sample(SKILLS, 6))
+    years = rng.randint(1, 15)
+    return (f"Candidate {index}\nSummary: {years} years of experience as a {rng.choice(TITLES)}.\n"
+            f"Skills: {skills}\nExperience:\n- Built and operated services using {skills}.\n"
+            f"- Led a project migrating a monolith to services.\nEducation: B.Sc. Computer Science\n") * 3
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def seed(admins=5, jobs_per_admin=10, candidates=1000, applications_per_job=50, status_mix=None, seed_value=0):
+    """Seed the bound database. Must run inside an app context.
+
+    Returns a dict describing what was created, including id ranges.
+    """
+    rng = random.Random(seed_value)
+    status_mix = status_mix or STATUS_MIX
+    statuses, weights = zip(*status_mix.items())
+    password_hash = generate_password_hash(SEED_PASSWORD)
+    start = time.perf_counter()
+
+    # Offset emails by existing rows so seeding twice doesn't collide
+    admin_offset = db.session.query(func.count(Admin.id)).scalar()
+    candidate_offset = db.session.query(func.count(Candidate.id)).scalar()
+
+    _insert(Admin, [{
+        'company_name': f'Bench Company {admin_offset + i}',
+        'email': f'admin{admin_offset + i}@bench.example',
+        'phone': '',
+        'password': password_hash,
+    } for i in range(admins)])
+    admin_ids = [row.id for row in db.session.query(Admin.id).order_by(Admin.id.desc()).limit(admins)]
+
+    _insert(Job, [{
+        'admin_id': admin_id,
+        'title': rng.choice(TITLES),
+        'description': f"We are hiring. Required skills: {', '.join(rng.sample(SKILLS, 5))}. " * 4,
+    } for admin_id in admin_ids for _ in range(jobs_per_admin)])
+    job_ids = [row.id for row in db.session.query(Job.id).filter(Job.admin_id.in_(admin_ids))]
+
+    _insert(Candidate, [{
+        'name': f'Bench Candidate {candidate_offset + i}',
+        'email': f'candidate{candidate_offset + i}@bench.example',
+        'password': password_hash,
+    } for i in range(candidates)])
+    candidate_ids = [row.id for row in db.session.query(Candidate.id).order_by(Candidate.id.desc()).limit(candidates)]
+
+    per_job = min(applications_per_job, len(candidate_ids))
+    rows = []
+    for job_id in job_ids:
+        for candidate_id in rng.sample(candidate_ids, per_job):
+            status = rng.choices(statuses, weights)[0]
+            rows.append({
+                'candidate_id': candidate_id,
+                'job_id': job_id,
+                'resume_text': _resume(rng, candidate_id),
+                'status': status,
+            })
+    _insert(Application, rows)
+    db.session.commit()
+
+    return {
+        'admins': admins,
+        'jobs': len(job_ids),
+        'candidates': candidates,
+        'applications': len(rows),
+        'admin_emails': [f'admin{admin_offset + i}@bench.example' for i in range(admins)],
+        'candidate_emails': [f'candidate{candidate_offset + i}@bench.example' for i in range(candidates)],
+        'job_ids': job_ids,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--admins', type=int, default=5)
+    parser.add_argument('--jobs-per-admin', type=int, default=10)
+    parser.add_argument('--candidates', type=int, default=1000)
+    parser.add_argument('--applications-per-job', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    from app import create_app
+    from schema import init_db
+    app = create_app()
+    with app.app_context():
+        init_db(db, retries=1)
+        result = seed(args.admins, args.jobs_per_admin, args.candidates, args.applications_per_job,
+                      seed_value=args.seed)
+    print(f"Seeded {result['admins']} admins, {result['jobs']} jobs, {result['candidates']} candidates, "
+          f"{result['applications']} applications in {result['seconds']:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
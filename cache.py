@@ -0,0 +1,140 @@
+"""Response/query cache for hot read endpoints.
+
+Reads go through a small per-process LRU first and then a shared Redis cache,
+so repeated dashboard loads stop opening database connections. Write paths call
+invalidate() with the affected keys. The local LRU keeps entries for at most
+CACHE_LOCAL_TTL seconds, which bounds how long another gunicorn worker can
+serve a value that was invalidated elsewhere.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from redis_client import get_redis
+from replica import on_primary
+
+KEY_PREFIX = 'cache:'
+LOCAL_TTL = int(os.getenv('CACHE_LOCAL_TTL', 5))
+LOCAL_MAX_ENTRIES = int(os.getenv('CACHE_LOCAL_MAX_ENTRIES', 512))
+
+
+class LocalLRU:
+    """Thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local = LocalLRU(LOCAL_MAX_ENTRIES)
+
+
+def cache_get(key):
+    """Return (found, value) for key, checking the local LRU before Redis."""
+    found, value = _local.get(key)
+    if found:
+        return True, value
+
+    redis_conn = get_redis()
+    if redis_conn is None:
+        return False, None
+    try:
+        raw = redis_conn.get(KEY_PREFIX + key)
+        if raw is None:
+            return False, None
+        value = json.loads(raw)
+        # Remaining Redis TTL is unknown here; the short local TTL keeps it fresh enough.
+        _local.set(key, value, LOCAL_TTL)
+        return True, value
+    except Exception as e:
+        print(f"CACHE: redis get failed for {key}: {e}")
+        return False, None
+
+
+def cache_set(key, value, ttl):
+    """Store a JSON-serializable value under key for ttl seconds."""
+    _local.set(key, value, min(ttl, LOCAL_TTL))
+    redis_conn = get_redis()
+    if redis_conn is None:
+        return
+    try:
+        redis_conn.setex(KEY_PREFIX + key, ttl, json.dumps(value))
+    except Exception as e:
+        print(f"CACHE: redis set failed for {key}: {e}")
+
+
+def invalidate(*keys):
+    """Drop keys from both cache tiers. Called from write paths after commit."""
+    for key in keys:
+        _local.delete(key)
+    redis_conn = get_redis()
+    if redis_conn is None or not keys:
+        return
+    try:
+        redis_conn.delete(*[KEY_PREFIX + key for key in keys])
+    except Exception as e:
+        print(f"CACHE: redis invalidate failed for {keys}: {e}")
+
+
+def cached(key, ttl, loader, refresh=False):
+    """Return the cached value for key, computing and storing it with loader() on a miss.
+
+    Misses load wherever the view reads from: the replica inside a @read_only
+    view, unless the user wrote within REPLICA_STICKY_SECONDS. refresh=True
+    skips the lookup (this process's LRU may predate an invalidation made
+    elsewhere) and reloads the value from the primary, since the caller is
+    asking for a change it was just told about.
+    """
+    if not refresh:
+        found, value = cache_get(key)
+        if found:
+            return value
+        value = loader()
+    else:
+        with on_primary():
+            value = loader()
+    cache_set(key, value, ttl)
+    return value
+
+
+# --- Cache keys for the hot read endpoints ---
+def jobs_key():
+    return 'jobs:all'
+
+
+def admin_jobs_key(admin_id):
+    return f'admin_jobs:{admin_id}'
+
+
+def interview_page_key(application_id):
+    return f'interview_page:{application_id}'
@@ -0,0 +1,210 @@
+"""Near-duplicate resume detection with MinHash signatures and LSH buckets.
+
+Each resume is reduced to word 5-gram shingles and a NUM_PERM MinHash
+signature. The signature is split into LSH_BANDS bands; every band is hashed
+into a row of resume_lsh_buckets, so finding look-alikes is one indexed
+lookup instead of a comparison against every application. Candidates that
+share a bucket are confirmed by their estimated Jaccard similarity.
+
+With 16 bands of 8 rows, pairs above ~0.7 similarity almost always share a
+bucket and pairs below ~0.5 rarely do; DUPLICATE_THRESHOLD makes the final call.
+
+numpy is imported on first use, so web and worker processes that never
+index a resume don't pay for it at startup.
+"""
+import hashlib
+import os
+import re
+
+from sqlalchemy import insert, update
+
+NUM_PERM = 128
+LSH_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 5
+DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', 0.8))
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+_permutations = None
+
+
+def _get_permutations():
+    """(a, b, prime, mask) of the NUM_PERM hash permutations, built on first use."""
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+        # Fixed seed: signatures must be comparable across processes and deploys
+        rng = np.random.RandomState(1)
+        _permutations = (rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64),
+                         rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64),
+                         np.uint64((1 << 61) - 1), np.uint64((1 << 32) - 1))
+    return _permutations
+
+
+def _shingle_hashes(text):
+    import numpy as np
+    tokens = TOKEN_RE.findall((text or '').lower())
+    if not tokens:
+        return None
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {' '.join(tokens)}
+    else:
+        shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles),
+        dtype=np.uint64, count=len(shingles))
+
+
+def signature(text):
+    """Return the MinHash signature (uint32 array of NUM_PERM) of text, or None if it has no words."""
+    import numpy as np
+    hashes = _shingle_hashes(text)
+    if hashes is None:
+        return None
+    a, b, prime, mask = _get_permutations()
+    # (a*x + b) mod p for every permutation and shingle; a, x < 2^32 so nothing overflows
+    permuted = ((np.outer(hashes, a) + b) % prime) & mask
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def to_bytes(sig):
+    import numpy as np
+    return sig.astype(np.uint32).tobytes()
+
+
+def from_bytes(data):
+    import numpy as np
+    return np.frombuffer(data, dtype=np.uint32)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the two resumes behind signatures a and b."""
+    return float((a == b).mean())
+
+
+def band_buckets(sig):
+    """[(band, bucket)] for a signature; bucket is a signed 63-bit hash of the band's rows."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        value = int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'little') >> 1
+        buckets.append((band, value))
+    return buckets
+
+
+def index_applications(db, items):
+    """Record signatures and LSH buckets for new applications and link near-duplicates.
+
+    items is a list of (application_id, candidate_id, resume_text) in ascending
+    id order. Each application is matched against everything indexed before it
+    for jobs of the same admin, including earlier items in the same call, except
+    the same candidate's own applications (reusing one resume across jobs is
+    normal). Other companies' applications are never matched, so duplicate_of_id
+    can't point outside the admin's dashboard; it always points at the first
+    application of a cluster. Returns {application_id: duplicate_of_id} for the
+    items that turned out to be duplicates. The caller commits.
+    """
+    from models import Application, Job, ResumeLshBucket
+
+    signatures = {}
+    owners = {application_id: candidate_id for application_id, candidate_id, _ in items}
+    for application_id, _, text in items:
+        sig = signature(text)
+        if sig is not None:
+            signatures[application_id] = sig
+    # Resumes without any words are stamped with an empty signature so backfills skip them
+    empty = [application_id for application_id in owners if application_id not in signatures]
+    if empty:
+        db.session.execute(update(Application).where(Application.id.in_(empty)).values(minhash=b''))
+    if not signatures:
+        return {}
+
+    buckets = {app_id: band_buckets(sig) for app_id, sig in signatures.items()}
+    all_pairs = {pair for pairs in buckets.values() for pair in pairs}
+    admin_of = dict(db.session.query(Application.id, Job.admin_id).join(Job, Job.id == Application.job_id).filter(
+        Application.id.in_(signatures)))
+
+    # Existing applications sharing any bucket with the batch. band IN / bucket IN is answered from
+    # ix_resume_lsh_buckets_band_bucket (a row-value IN, or a join to the admin's jobs, makes the
+    # planner scan instead); pairs the batch doesn't have are dropped here and other admins'
+    # applications by the next query.
+    existing = {}
+    for row in db.session.query(ResumeLshBucket.band, ResumeLshBucket.bucket, ResumeLshBucket.application_id).filter(
+            ResumeLshBucket.band.in_({band for band, _ in all_pairs}),
+            ResumeLshBucket.bucket.in_({bucket for _, bucket in all_pairs})):
+        if (row.band, row.bucket) in all_pairs:
+            existing.setdefault((row.band, row.bucket), set()).add(row.application_id)
+    candidate_ids = {app_id for ids in existing.values() for app_id in ids} - set(signatures)
+    known = {}
+    if candidate_ids:
+        for row in db.session.query(Application.id, Application.candidate_id, Application.minhash,
+                                    Application.duplicate_of_id, Job.admin_id).join(
+                Job, Job.id == Application.job_id).filter(Application.id.in_(candidate_ids),
+                                                          Job.admin_id.in_(set(admin_of.values()))):
+            admin_of[row.id] = row.admin_id
+            if row.minhash:
+                known[row.id] = (from_bytes(row.minhash), row.candidate_id, row.duplicate_of_id or row.id)
+    # Owners of the cluster roots, so a candidate is never flagged as copying their own resume
+    owner_of = {app_id: entry[1] for app_id, entry in known.items()}
+    missing_roots = {entry[2] for entry in known.values()} - set(owner_of)
+    if missing_roots:
+        for row in db.session.query(Application.id, Application.candidate_id, Job.admin_id).join(
+                Job, Job.id == Application.job_id).filter(Application.id.in_(missing_roots)):
+            owner_of[row.id] = row.candidate_id
+            admin_of[row.id] = row.admin_id
+
+    duplicates = {}
+    for application_id, candidate_id, _ in items:
+        sig = signatures.get(application_id)
+        if sig is None:
+            continue
+        matches = set()
+        for key in buckets[application_id]:
+            matches |= existing.get(key, set())
+        best_root = None
+        admin_id = admin_of.get(application_id)
+        for other in matches - {application_id}:
+            if other not in known:
+                continue
+            other_sig, other_candidate, root = known[other]
+            if candidate_id in (other_candidate, owner_of.get(root)):
+                continue
+            # A batch can span admins (backfills); clusters linked before matching was scoped can too
+            if admin_id is None or admin_id != admin_of.get(other) or admin_id != admin_of.get(root):
+                continue
+            if similarity(sig, other_sig) >= DUPLICATE_THRESHOLD and (best_root is None or root < best_root):
+                best_root = root
+        if best_root is not None:
+            duplicates[application_id] = best_root
+        # Later items in this batch can match this one
+        known[application_id] = (sig, candidate_id, best_root or application_id)
+        owner_of[application_id] = candidate_id
+        for key in buckets[application_id]:
+            existing.setdefault(key, set()).add(application_id)
+
+    db.session.execute(update(Application), [
+        {'id': app_id, 'minhash': to_bytes(sig), 'duplicate_of_id': duplicates.get(app_id)}
+        for app_id, sig in signatures.items()
+    ])
+    db.session.execute(insert(ResumeLshBucket), [
+        {'application_id': app_id, 'band': band, 'bucket': bucket}
+        for app_id, pairs in buckets.items() for band, bucket in pairs
+    ])
+    return duplicates
+
+
+def index_pending(db, batch_size=500):
+    """Index applications that have no signature yet (backfill). Returns the number indexed."""
+    from models import Application
+    done = 0
+    while True:
+        rows = db.session.query(Application.id, Application.candidate_id, Application.resume_text).filter(
+            Application.minhash.is_(None)
+        ).order_by(Application.id).limit(batch_size).all()
+        if not rows:
+            break
+        index_applications(db, [(row.id, row.candidate_id, row.resume_text) for row in rows])
+        db.session.commit()
+        done += len(rows)
+    return done
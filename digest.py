@@ -0,0 +1,161 @@
+"""Compact resume digests shared by every prompt that describes a candidate.
+
+A digest lists skills, roles, years of experience, key projects and education
+pulled out of the resume text, trimmed to RESUME_DIGEST_TOKENS. It is computed
+locally (no model call), stored on the application with a hash of the resume
+it came from, and recomputed only when that hash no longer matches.
+"""
+import hashlib
+import os
+import re
+from datetime import datetime
+
+# Bump when the extraction changes so stored digests are rebuilt on next use
+DIGEST_VERSION = 2
+RESUME_DIGEST_TOKENS = int(os.getenv('RESUME_DIGEST_TOKENS', 350))
+# Approximate token budget for job descriptions in prompts
+JOB_PROMPT_TOKENS = int(os.getenv('JOB_PROMPT_TOKENS', 250))
+# Rough chars-per-token for English prose; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+KNOWN_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'Go', 'Golang', 'Rust', 'C++', 'C#', 'Ruby', 'PHP', 'Kotlin',
+    'Swift', 'Scala', 'R', 'SQL', 'NoSQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'Kafka',
+    'RabbitMQ', 'Spark', 'Hadoop', 'Airflow', 'dbt', 'Snowflake', 'BigQuery', 'Flask', 'Django', 'FastAPI',
+    'Spring', 'Node.js', 'Express', 'React', 'Angular', 'Vue', 'Next.js', 'HTML', 'CSS', 'GraphQL', 'REST',
+    'gRPC', 'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'AWS', 'GCP', 'Azure', 'Linux', 'Git', 'CI/CD',
+    'Jenkins', 'GitHub Actions', 'Microservices', 'Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision',
+    'TensorFlow', 'PyTorch', 'scikit-learn', 'Pandas', 'NumPy', 'Tableau', 'Power BI', 'Excel', 'Figma',
+    'Agile', 'Scrum', 'Jira', 'Selenium', 'Android', 'iOS', 'Flutter', 'React Native', 'Security', 'Networking',
+]
+
+
+# Very short names (Go, R) are matched case-sensitively so ordinary words don't count, and
+# not when glued to & - ' or a dotted suffix (R&D, Go-to-market, R's)
+def _skill_pattern(skill):
+    if len(skill) > 2:
+        return re.compile(r'(?<![\w+#.])' + re.escape(skill) + r'(?![\w+#])', re.IGNORECASE)
+    return re.compile(r"(?<![\w+#.&'-])" + re.escape(skill) + r"(?![\w+#&'-]|\.\w)")
+
+
+_SKILL_PATTERNS = [(skill, _skill_pattern(skill)) for skill in KNOWN_SKILLS]
+SECTION_LABEL_RE = re.compile(r'^(?:summary|profile|experience|education|projects?)\s*:\s*', re.I)
+
+SKILLS_HEADER_RE = re.compile(r'^\s*(?:technical\s+)?(?:skills|technologies|tech stack|tools)\s*[:\-]\s*(.+)$', re.I)
+YEARS_RE = re.compile(r'(\d{1,2})\s*\+?\s*(?:years|yrs)\b', re.I)
+DATE_RANGE_RE = re.compile(r'\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now)\b', re.I)
+ROLE_RE = re.compile(r'\b(engineer|developer|manager|analyst|scientist|architect|designer|consultant|'
+                     r'administrator|specialist|intern|lead|director|devops|sre)\b', re.I)
+PROJECT_RE = re.compile(r'\b(built|developed|designed|led|implemented|migrated|created|launched|architected|'
+                        r'optimi[sz]ed|improved|reduced|increased|automated|delivered|scaled)\b', re.I)
+EDUCATION_RE = re.compile(r'\b(b\.?\s?sc|bachelor|master|m\.?\s?sc|ph\.?\s?d|b\.?\s?tech|m\.?\s?tech|mba|'
+                          r'b\.?\s?e\b|degree|university|college)', re.I)
+
+
+def resume_hash(resume_text):
+    """Hash identifying the resume text (and digest version) a digest was built from."""
+    return hashlib.sha256(f'{DIGEST_VERSION}:{resume_text or ""}'.encode('utf-8')).hexdigest()
+
+
+def _lines(text):
+    seen, lines = set(), []
+    for raw in (text or '').splitlines():
+        line = SECTION_LABEL_RE.sub('', re.sub(r'\s+', ' ', raw).strip(' \t-•*·'))
+        if line and line.lower() not in seen:
+            seen.add(line.lower())
+            lines.append(line)
+    return lines
+
+
+def _clip(text, limit):
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+
+def _skills(text, lines):
+    found = []
+    for line in lines:
+        match = SKILLS_HEADER_RE.match(line)
+        if match:
+            found += [s.strip() for s in re.split(r'[,;|/]', match.group(1)) if 1 < len(s.strip()) <= 40]
+    found += [skill for skill, pattern in _SKILL_PATTERNS if pattern.search(text)]
+    unique, seen = [], set()
+    for skill in found:
+        if skill.lower() not in seen:
+            seen.add(skill.lower())
+            unique.append(skill)
+    return unique[:25]
+
+
+def _years(text):
+    stated = [int(y) for y in YEARS_RE.findall(text) if 0 < int(y) < 50]
+    spans = []
+    for start, end in DATE_RANGE_RE.findall(text):
+        end_year = datetime.utcnow().year if not end[:1].isdigit() else int(end)
+        if int(start) <= end_year:
+            spans.append((int(start), end_year))
+    from_dates = (max(e for _, e in spans) - min(s for s, _ in spans)) if spans else 0
+    years = max(stated + [from_dates])
+    return years or None
+
+
+def build_digest(resume_text, token_budget=None):
+    """Return the compact digest for a resume, at most token_budget (approximate) tokens."""
+    budget = (token_budget or RESUME_DIGEST_TOKENS) * CHARS_PER_TOKEN
+    text = resume_text or ''
+    lines = _lines(text)
+
+    sections = []
+    skills = _skills(text, lines)
+    if skills:
+        sections.append('Skills: ' + ', '.join(skills))
+    years = _years(text)
+    if years:
+        sections.append(f'Experience: ~{years} years')
+    roles = [_clip(l, 80) for l in lines if ROLE_RE.search(l) and len(l) <= 100 and not PROJECT_RE.search(l)][:4]
+    if roles:
+        sections.append('Roles: ' + '; '.join(roles))
+    projects = [_clip(l, 160) for l in lines if PROJECT_RE.search(l) and len(l) >= 20][:5]
+    if projects:
+        sections.append('Key projects:\n' + '\n'.join(f'- {p}' for p in projects))
+    education = [_clip(l, 100) for l in lines if EDUCATION_RE.search(l)][:2]
+    if education:
+        sections.append('Education: ' + '; '.join(education))
+
+    digest = ''
+    for section in sections:
+        candidate = f'{digest}\n{section}' if digest else section
+        if len(candidate) > budget:
+            # Drop whole bullet lines from the section that overflows rather than cutting mid-word
+            for line in section.splitlines():
+                extended = f'{digest}\n{line}' if digest else line
+                if len(extended) > budget:
+                    break
+                digest = extended
+            break
+        digest = candidate
+
+    # Unstructured resumes yield little; fill the rest of the budget with the opening text
+    remaining = budget - len(digest) - len('\nResume excerpt: ')
+    if len(sections) < 3 and remaining > 80:
+        excerpt = _clip(' '.join(lines), remaining)
+        digest = f'{digest}\nResume excerpt: {excerpt}' if digest else f'Resume excerpt: {excerpt}'
+    return digest
+
+
+def digest_columns(resume_text):
+    """Column values for a new application row: {'resume_digest': ..., 'resume_digest_hash': ...}."""
+    return {'resume_digest': build_digest(resume_text), 'resume_digest_hash': resume_hash(resume_text)}
+
+
+def resume_digest(application):
+    """Return the application's digest, rebuilding it if the resume changed. The caller commits."""
+    current = resume_hash(application.resume_text)
+    if application.resume_digest is None or application.resume_digest_hash != current:
+        application.resume_digest = build_digest(application.resume_text)
+        application.resume_digest_hash = current
+    return application.resume_digest
+
+
+def fit_budget(text, tokens):
+    """Trim free text (e.g. a job description) to roughly the given number of tokens."""
+    return _clip((text or '').strip(), tokens * CHARS_PER_TOKEN)
@@ -0,0 +1,228 @@
+"""Resume and job description embeddings with an in-memory top-K index.
+
+The default backend is a deterministic hashing vectorizer (word unigrams and
+bigrams hashed into EMBEDDING_DIM buckets), so embeddings work offline and
+cost well under a millisecond per document. Set EMBEDDING_BACKEND=gemini to
+use Gemini's embedding model instead. Vectors are stored as float32 bytes next
+to the row together with the backend name; rows embedded by another backend
+are ignored until re-embedded (`flask --app app embed`). numpy is imported
+on first use, like the Gemini SDK in llm.py, to keep process startup cheap.
+"""
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import update
+
+from cache import LocalLRU
+
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'hashing')
+EMBEDDING_DIM = int(os.getenv('EMBEDDING_DIM', 512))
+GEMINI_EMBEDDING_MODEL = os.getenv('GEMINI_EMBEDDING_MODEL', 'models/text-embedding-004')
+# Seconds an in-memory index is reused before it is rebuilt from the database
+INDEX_TTL = int(os.getenv('EMBEDDING_INDEX_TTL', 60))
+# Long resumes are truncated before embedding; the top of a resume carries the signal
+MAX_EMBED_CHARS = 20000
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def model_name():
+    """Identifier stored with each vector; vectors from different backends never mix."""
+    if EMBEDDING_BACKEND == 'gemini':
+        return f'gemini:{GEMINI_EMBEDDING_MODEL}'
+    return f'hashing-{EMBEDDING_DIM}'
+
+
+def is_local():
+    return EMBEDDING_BACKEND != 'gemini'
+
+
+def _bucket(feature):
+    digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+    value = int.from_bytes(digest, 'little')
+    # Low bits pick the bucket, the top bit the sign (reduces collision bias)
+    return value % EMBEDDING_DIM, (1.0 if value >> 63 else -1.0)
+
+
+def _hashing_embed(text):
+    import numpy as np
+    tokens = TOKEN_RE.findall(text.lower())
+    features = Counter(tokens)
+    features.update(f'{a} {b}' for a, b in zip(tokens, tokens[1:]))
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for feature, count in features.items():
+        index, sign = _bucket(feature)
+        vector[index] += sign * (1.0 + math.log(count))
+    return vector
+
+
+def _gemini_embed(text):
+    import numpy as np
+    from llm import BULK, embed_content, get_model
+    if get_model() is None:
+        return None
+    # Embeddings draw on the same Gemini quota, behind interviews like any bulk call
+    result = embed_content(BULK, model=GEMINI_EMBEDDING_MODEL, content=text, task_type='retrieval_document')
+    return np.asarray(result['embedding'], dtype=np.float32)
+
+
+def embed(text):
+    """Return a unit-length float32 vector for text, or None if it can't be embedded."""
+    import numpy as np
+    text = (text or '')[:MAX_EMBED_CHARS]
+    if not text.strip():
+        return None
+    try:
+        vector = _gemini_embed(text) if EMBEDDING_BACKEND == 'gemini' else _hashing_embed(text)
+    except Exception as e:
+        print(f"EMBEDDING: failed to embed text: {e}")
+        return None
+    if vector is None:
+        return None
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+def to_bytes(vector):
+    import numpy as np
+    return None if vector is None else vector.astype(np.float32).tobytes()
+
+
+def from_bytes(data):
+    import numpy as np
+    return np.frombuffer(data, dtype=np.float32)
+
+
+def embedding_columns(text):
+    """Column values for a row whose text is text: {'embedding': ..., 'embedding_model': ...}."""
+    vector = embed(text)
+    return {'embedding': to_bytes(vector), 'embedding_model': model_name() if vector is not None else None}
+
+
+def set_embedding(row, text):
+    """Set embedding/embedding_model on a Job or Application instance."""
+    for key, value in embedding_columns(text).items():
+        setattr(row, key, value)
+
+
+class VectorIndex:
+    """Dense top-K cosine similarity over unit vectors (one matrix multiply per query)."""
+
+    def __init__(self, ids, vectors, payload=None):
+        import numpy as np
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.matrix = np.vstack(vectors) if len(vectors) else np.zeros((0, 1), dtype=np.float32)
+        self.payload = payload or {}
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def top_k(self, query, k, exclude=()):
+        """Return [(id, score)] for the k most similar rows, best first."""
+        import numpy as np
+        if k <= 0 or not len(self.ids) or query is None or query.shape[0] != self.matrix.shape[1]:
+            return []
+        scores = self.matrix @ query
+        if exclude:
+            scores[np.isin(self.ids, list(exclude))] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+_job_index = None
+_job_index_lock = threading.Lock()
+_application_indexes = LocalLRU(int(os.getenv('EMBEDDING_INDEX_MAX_ADMINS', 64)))
+
+
+def _load_rows(query):
+    ids, vectors, payload = [], [], {}
+    current = model_name()
+    for row in query:
+        if row.embedding is None or row.embedding_model != current:
+            continue
+        ids.append(row.id)
+        vectors.append(from_bytes(row.embedding))
+        payload[row.id] = row
+    return VectorIndex(ids, vectors, payload)
+
+
+def job_index(db):
+    """Index over open jobs' descriptions, rebuilt at most every INDEX_TTL seconds."""
+    global _job_index
+    from models import Admin, Job
+    with _job_index_lock:
+        if _job_index is None or time.monotonic() - _job_index.built_at > INDEX_TTL:
+            _job_index = _load_rows(db.session.query(
+                Job.id, Job.title, Job.embedding, Job.embedding_model, Admin.company_name
+            ).join(Admin).filter(Job.status == 'open'))
+        return _job_index
+
+
+def application_index(db, admin_id):
+    """Index over resumes submitted to any of an admin's jobs."""
+    from models import Application, Candidate, Job
+    found, index = _application_indexes.get(admin_id)
+    if found:
+        return index
+    index = _load_rows(db.session.query(
+        Application.id, Application.candidate_id, Application.job_id, Application.status,
+        Application.embedding, Application.embedding_model, Candidate.name, Candidate.email,
+        Job.title.label('job_title')
+    ).join(Job, Application.job_id == Job.id).join(Candidate, Application.candidate_id == Candidate.id)
+        .filter(Job.admin_id == admin_id))
+    _application_indexes.set(admin_id, index, INDEX_TTL)
+    return index
+
+
+def invalidate_indexes(admin_id=None):
+    """Drop this process's cached indexes after new jobs or applications are embedded."""
+    global _job_index
+    with _job_index_lock:
+        _job_index = None
+    if admin_id is None:
+        _application_indexes.clear()
+    else:
+        _application_indexes.delete(admin_id)
+
+
+def embed_pending(db, batch_size=500):
+    """Embed jobs and applications that have no vector for the current backend.
+
+    Returns (jobs embedded, applications embedded). Used by `flask --app app embed`
+    to backfill existing rows or switch backends; safe to re-run.
+    """
+    from models import Application, Job
+    current = model_name()
+    totals = []
+    for model in (Job, Application):
+        text_column = model.description if model is Job else model.resume_text
+        done = 0
+        last_id = 0
+        while True:
+            rows = db.session.query(model.id, text_column.label('text')).filter(
+                model.id > last_id,
+                (model.embedding_model.is_(None)) | (model.embedding_model != current)
+            ).order_by(model.id).limit(batch_size).all()
+            if not rows:
+                break
+            updates = []
+            for row in rows:
+                columns = embedding_columns(row.text)
+                if columns['embedding'] is not None:
+                    updates.append({'id': row.id, **columns})
+            if updates:
+                db.session.execute(update(model), updates)
+            db.session.commit()
+            done += len(updates)
+            last_id = rows[-1].id
+        totals.append(done)
+    invalidate_indexes()
+    return tuple(totals)
@@ -0,0 +1,16 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from replica import RoutingSession
+
+# Created unbound; create_app() attaches it with db.init_app(app).
+# No connection is opened until the first query. Sessions route @read_only
+# views to the read replica when one is configured (see replica.py).
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+def release_connection():
+    """End the current transaction so its pooled connection is returned before
+    a slow network call (Gemini, SMTP). Loaded ORM objects are expired and
+    reload on next access; only call this with no pending writes.
+    """
+    db.session.commit()
@@ -0,0 +1,27 @@
+"""Gunicorn configuration.
+
+Most request time is spent waiting on Gemini, so workers default to gevent:
+each worker process runs many requests as greenlets and yields while a model
+call is in flight, instead of a sync worker blocking for its full duration.
+Set GUNICORN_WORKER_CLASS=sync to fall back to the old behaviour.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+# Concurrent greenlets per worker. Database access is bounded separately by
+# the SQLAlchemy pool (DB_POOL_SIZE + max_overflow), and request handlers
+# return their connection before each model call.
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 500))
+# Only bounds a blocked request on sync workers, where model calls can take tens of seconds
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        # psycopg2 does its I/O in C; make it yield to the gevent hub while waiting
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -0,0 +1,217 @@
+"""Bulk resume ingestion: ZIP archives of PDF/DOCX resumes or a CSV export.
+
+Rows are read lazily from the upload, resume text is extracted in a process
+pool (PDF parsing is CPU-bound) and candidates/applications are written with
+one multi-row INSERT per batch instead of one request per resume.
+"""
+import csv
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+import embeddings
+from dedup import index_applications
+from digest import digest_columns
+from extensions import db
+from live_updates import queue_job_refresh
+from models import Application, Candidate, Job
+from resume_parsing import extract_resume_text, is_supported_resume
+
+# Ingested candidates get an unusable password hash: check_password_hash()
+# always fails on it, and registering with the same email claims the account.
+# This also skips one expensive password hash per imported row.
+UNUSABLE_PASSWORD = '!'
+
+UPLOAD_KEY_PREFIX = 'ingest:upload:'
+UPLOAD_TTL = 3600
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 200))
+INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', os.cpu_count() or 1))
+# Uploaded archive and per-resume size limits (bytes); guards against zip bombs
+MAX_INGEST_BYTES = int(os.getenv('MAX_INGEST_BYTES', 200 * 1024 * 1024))
+MAX_RESUME_BYTES = 10 * 1024 * 1024
+
+EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+
+
+def is_supported_upload(filename):
+    return bool(filename) and filename.lower().endswith(('.zip', '.csv'))
+
+
+def _guess_name(text, filename):
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            if len(line) <= 60 and not EMAIL_RE.search(line):
+                return line
+            break
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return re.sub(r'[_\-.]+', ' ', stem).strip() or 'Candidate'
+
+
+def _to_row(source, text, name=None, email=None):
+    """Build a candidate row from extracted text, or an error entry."""
+    text = (text or '').strip()
+    if not text:
+        return {'source': source, 'error': 'no text extracted'}
+    if not email:
+        match = EMAIL_RE.search(text)
+        email = match.group(0) if match else None
+    if not email:
+        return {'source': source, 'error': 'no email address found'}
+    return {
+        'source': source,
+        'name': (name or _guess_name(text, source)).strip()[:255],
+        'email': email.strip().lower()[:255],
+        'resume_text': text,
+    }
+
+
+def _extract_member(item):
+    """Process-pool worker: (member name, bytes) -> row dict."""
+    source, data = item
+    try:
+        return _to_row(source, extract_resume_text(source, data))
+    except Exception as e:
+        return {'source': source, 'error': f'extraction failed: {e}'}
+
+
+def _iter_zip(data):
+    """Yield (name, bytes) for supported resumes without unpacking the whole archive."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not is_supported_resume(info.filename):
+                continue
+            if '__MACOSX/' in info.filename or os.path.basename(info.filename).startswith('.'):
+                continue
+            if info.file_size > MAX_RESUME_BYTES:
+                yield info.filename, None
+                continue
+            yield info.filename, archive.read(info)
+
+
+def _iter_csv(data):
+    """Yield row dicts from a CSV with name, email and resume_text (or resume) columns."""
+    reader = csv.DictReader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8-sig', newline=''))
+    fields = {(f or '').strip().lower(): f for f in reader.fieldnames or []}
+    text_field = fields.get('resume_text') or fields.get('resume')
+    name_field, email_field = fields.get('name'), fields.get('email')
+    if not text_field:
+        raise ValueError('CSV must have a resume_text (or resume) column.')
+    for number, row in enumerate(reader, start=2):
+        yield _to_row(f'line {number}', row.get(text_field),
+                      name=row.get(name_field) if name_field else None,
+                      email=row.get(email_field) if email_field else None)
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_row_batches(filename, data, workers=None):
+    """Yield lists of row dicts (or error entries) parsed from an upload.
+
+    ZIP members are extracted in a process pool; the next batch is submitted
+    before the current one is handed back, so extraction overlaps the inserts.
+    """
+    if filename.lower().endswith('.csv'):
+        yield from _chunks(_iter_csv(data), INGEST_BATCH_SIZE)
+        return
+
+    def oversized(source):
+        return {'source': source, 'error': 'file too large'}
+
+    members = _chunks(_iter_zip(data), INGEST_BATCH_SIZE)
+    workers = workers or INGEST_WORKERS
+    if workers <= 1:
+        for chunk in members:
+            yield [_extract_member(item) if item[1] is not None else oversized(item[0]) for item in chunk]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit(chunk):
+            return [pool.submit(_extract_member, item) if item[1] is not None else oversized(item[0])
+                    for item in chunk]
+
+        pending = None
+        for chunk in members:
+            submitted = submit(chunk)
+            if pending is not None:
+                yield [f.result() if not isinstance(f, dict) else f for f in pending]
+            pending = submitted
+        if pending is not None:
+            yield [f.result() if not isinstance(f, dict) else f for f in pending]
+
+
+def _insert_batch(job_id, rows, attach_registered=False):
+    """Create missing candidates and their applications for one batch."""
+    # Locked until the batch commits, so a concurrent close or archive waits for it or stops it
+    job = db.session.query(Job.status, Job.admin_id).filter(Job.id == job_id).with_for_update().first()
+    if job is None or job.status != 'open':
+        raise ValueError(f'Job {job_id} is {job.status if job else "gone"}; it no longer accepts applications.')
+    by_email = {}
+    for row in rows:
+        by_email.setdefault(row['email'], row)
+    emails = list(by_email)
+
+    existing = db.session.query(Candidate.email, Candidate.id, Candidate.password).filter(
+        Candidate.email.in_(emails)).all()
+    candidate_ids = {row.email: row.id for row in existing}
+    # Accounts someone signed up for, as opposed to ones an earlier import created
+    registered = [{'source': by_email[row.email]['source'], 'email': row.email, 'candidate_id': row.id}
+                  for row in existing if row.password != UNUSABLE_PASSWORD]
+    if not attach_registered:
+        emails = [e for e in emails if e not in {match['email'] for match in registered}]
+    new_candidates = [{'name': by_email[e]['name'], 'email': e, 'password': UNUSABLE_PASSWORD}
+                      for e in emails if e not in candidate_ids]
+    if new_candidates:
+        db.session.execute(insert(Candidate), new_candidates)
+        candidate_ids.update(db.session.query(Candidate.email, Candidate.id).filter(
+            Candidate.email.in_([c['email'] for c in new_candidates])))
+
+    already_applied = {row.candidate_id for row in db.session.query(Application.candidate_id).filter(
+        Application.job_id == job_id, Application.candidate_id.in_([candidate_ids[e] for e in emails]))}
+    new_applications = [{'candidate_id': candidate_ids[e], 'job_id': job_id,
+                         'resume_text': by_email[e]['resume_text'], 'status': 'Applied',
+                         **digest_columns(by_email[e]['resume_text'])}
+                        for e in emails if candidate_ids[e] not in already_applied]
+    if embeddings.is_local():
+        for application in new_applications:
+            application.update(embeddings.embedding_columns(application['resume_text']))
+    if new_applications:
+        db.session.execute(insert(Application), new_applications)
+        inserted = db.session.query(Application.id, Application.candidate_id, Application.resume_text).filter(
+            Application.job_id == job_id,
+            Application.candidate_id.in_([a['candidate_id'] for a in new_applications])
+        ).order_by(Application.id).all()
+        index_applications(db, [(row.id, row.candidate_id, row.resume_text) for row in inserted])
+        queue_job_refresh(db.session, job.admin_id, job_id)
+    db.session.commit()
+    return len(new_candidates), len(new_applications), len(rows) - len(new_applications), registered
+
+
+def insert_batch(job_id, rows, attach_registered=False):
+    """Insert one batch, retrying once if a concurrent signup or apply won a race.
+
+    Raises ValueError once the job is no longer open.
+    Rows whose email belongs to a registered candidate are skipped unless
+    attach_registered is set; either way they are returned so the import
+    result can list them. Returns (candidates created, applications created,
+    rows skipped, registered matches).
+    """
+    try:
+        return _insert_batch(job_id, rows, attach_registered)
+    except IntegrityError:
+        db.session.rollback()
+        return _insert_batch(job_id, rows, attach_registered)
@@ -0,0 +1,119 @@
+"""Live admin dashboard updates over Server-Sent Events.
+
+Every committed change to Application.status (including new applications)
+made through the ORM is published as a compact delta on the Redis channel of
+the job's admin. Bulk insert()/update()/delete() statements skip the flush
+hooks, so code issuing them calls queue_job_refresh() in the same
+transaction; dashboards reload the whole job on that event. Each SSE stream subscribes to its admin's channel, so a change made in any
+gunicorn worker or RQ worker reaches every open dashboard. The admin's cached
+dashboard payload is invalidated before the delta goes out, so a dashboard
+reloading in response never gets the pre-change copy back from Redis.
+"""
+import json
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from cache import admin_jobs_key, invalidate
+from models import Application, Job
+from redis_client import get_redis, new_pubsub
+
+CHANNEL_PREFIX = 'admin_events:'
+HEARTBEAT_SECONDS = 15
+# Streams are closed after this long; EventSource reconnects on its own. This
+# bounds how long one connection can occupy a worker.
+STREAM_MAX_SECONDS = int(os.getenv('SSE_MAX_SECONDS', 300))
+
+_PENDING_KEY = 'status_deltas'
+
+
+def admin_channel(admin_id):
+    return f'{CHANNEL_PREFIX}{admin_id}'
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_status_changes(session, flush_context):
+    changed = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Application):
+            continue
+        if obj in session.new or inspect(obj).attrs.status.history.has_changes():
+            changed.append(obj)
+    if not changed:
+        return
+
+    # Resolve owning admins on the flush's own connection (no ORM autoflush here)
+    job_ids = {obj.job_id for obj in changed}
+    admin_by_job = dict(session.connection().execute(
+        select(Job.id, Job.admin_id).where(Job.id.in_(job_ids))
+    ).all())
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    ts = datetime.utcnow().isoformat()
+    for obj in changed:
+        pending.append((admin_by_job.get(obj.job_id), {
+            'type': 'status',
+            'application_id': obj.id,
+            'job_id': obj.job_id,
+            'status': obj.status,
+            'ts': ts,
+        }))
+
+
+def queue_job_refresh(session, admin_id, job_id):
+    """Publish a job-level refresh event once session commits.
+
+    For bulk statements on applications, which the flush hooks never see.
+    """
+    session.info.setdefault(_PENDING_KEY, []).append((admin_id, {
+        'type': 'refresh',
+        'job_id': job_id,
+        'ts': datetime.utcnow().isoformat(),
+    }))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_status_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    invalidate(*{admin_jobs_key(admin_id) for admin_id, _ in pending if admin_id is not None})
+    redis_conn = get_redis()
+    if redis_conn is None:
+        return
+    try:
+        pipe = redis_conn.pipeline(transaction=False)
+        for admin_id, delta in pending:
+            if admin_id is not None:
+                pipe.publish(admin_channel(admin_id), json.dumps(delta))
+        pipe.execute()
+    except Exception as e:
+        print(f"LIVE_UPDATES: publish failed: {e}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_status_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def stream_admin_events(admin_id):
+    """Yield SSE frames for an admin's status deltas and job refreshes until STREAM_MAX_SECONDS elapse."""
+    pubsub = new_pubsub()
+    pubsub.subscribe(admin_channel(admin_id))
+    deadline = time.monotonic() + STREAM_MAX_SECONDS
+    try:
+        # Tell the client how quickly to reconnect once the stream is recycled
+        yield 'retry: 3000\n\n'
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                yield ': keepalive\n\n'
+                continue
+            data = message['data']
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+            yield f'event: status\ndata: {data}\n\n'
+    finally:
+        pubsub.close()
@@ -0,0 +1,312 @@
+import math
+import os
+import threading
+import time
+import uuid
+
+# --- Gemini API Configuration ---
+# google.generativeai pulls in grpc and protobuf, which dominate import time.
+# It is imported and configured on the first call to get_model() instead of at
+# import, so RQ workers that never call the model don't pay for it.
+_model = None
+_configured = False
+_lock = threading.Lock()
+
+
+def _transport():
+    """Pick the Gemini transport. grpc's C core blocks a gevent hub, so under
+    gevent workers the REST transport (plain, monkey-patched sockets) is used.
+    """
+    transport = os.getenv('GEMINI_TRANSPORT')
+    if transport:
+        return transport
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('socket'):
+            return 'rest'
+    except ImportError:
+        pass
+    return None
+
+
+def get_model():
+    """Return the shared Gemini model, configuring the SDK on first use.
+
+    Returns None if the API key is missing or configuration fails; callers
+    fall back to their non-AI defaults in that case.
+    """
+    global _model, _configured
+    if _configured:
+        return _model
+    with _lock:
+        if _configured:
+            return _model
+        try:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key: raise ValueError("GEMINI_API_KEY not found.")
+            import google.generativeai as genai
+            genai.configure(api_key=api_key, transport=_transport())
+            _model = genai.GenerativeModel('gemini-flash-latest')
+        except Exception as e:
+            print(f"FATAL: Error configuring Gemini API: {e}")
+            _model = None
+        _configured = True
+    return _model
+
+
+def set_model(model):
+    """Install a model object (anything with generate_content) in place of
+    Gemini, e.g. the latency-configurable fake used by the benchmarks.
+    """
+    global _model, _configured
+    with _lock:
+        _model = model
+        _configured = True
+
+
+# --- Model call scheduling ---
+# Every web and RQ process shares one Gemini quota. Calls take a token from a
+# global bucket (LLM_REQUESTS_PER_MINUTE, kept in Redis when REDIS_URL is set,
+# else per process) before reaching the model. Lower-priority classes must
+# leave a reserve in the bucket and stand back while a higher class is
+# waiting, so a bulk shortlisting run can't starve candidates mid-interview.
+# Bulk calls also pass the admin as tenant: active tenants split the bulk
+# rate evenly, so one admin's 10k-resume job doesn't stall everyone else's.
+INTERACTIVE, QUESTIONS, SCORECARD, BULK = 0, 1, 2, 3
+PRIORITY_NAMES = ('interactive', 'questions', 'scorecard', 'bulk')
+# Fraction of the burst capacity each class must leave untouched
+PRIORITY_RESERVE = (0.0, 0.1, 0.2, 0.4)
+# Longest a call waits for a token before giving up (seconds)
+PRIORITY_MAX_WAIT = (10.0, 20.0, 60.0, 300.0)
+
+LLM_REQUESTS_PER_MINUTE = float(os.getenv('LLM_REQUESTS_PER_MINUTE', 600))
+LLM_BURST = float(os.getenv('LLM_BURST', max(1.0, LLM_REQUESTS_PER_MINUTE / 6)))
+# A waiter or tenant not seen for this long is forgotten (e.g. its process died)
+PRESENCE_TTL_MS = 3000
+MAX_POLL_SECONDS = 1.0
+BUDGET_KEY = 'llm:budget'
+WAITERS_KEY = 'llm:waiters'
+TENANTS_KEY = 'llm:tenants'
+TENANT_KEY_PREFIX = 'llm:tenant:'
+
+
+class SchedulerBusy(Exception):
+    """No model call slot became free within the priority's wait limit."""
+
+
+# KEYS: budget, waiters, tenants, tenant budget (or '')
+# ARGV: rate per ms, capacity, priority, reserve, waiter id, presence ttl ms, tenant (or '')
+# Returns 0 when a token was taken, else milliseconds to wait before retrying.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rate, capacity = tonumber(ARGV[1]), tonumber(ARGV[2])
+local priority, reserve = tonumber(ARGV[3]), tonumber(ARGV[4])
+local waiter, ttl, tenant = ARGV[5], tonumber(ARGV[6]), ARGV[7]
+
+local function refill(key, key_rate, key_capacity)
+  local state = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(state[1]) or key_capacity
+  local ts = tonumber(state[2]) or now
+  return math.min(key_capacity, tokens + math.max(0, now - ts) * key_rate)
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local blocked = false
+for _, member in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+  if tonumber(string.match(member, '^(%d+):')) < priority then blocked = true break end
+end
+
+local tokens = refill(KEYS[1], rate, capacity)
+local wait = 0
+if blocked then wait = 100 end
+if tokens < 1 + reserve then wait = math.max(wait, math.ceil((1 + reserve - tokens) / rate)) end
+
+local tenant_tokens, tenant_rate, tenant_capacity
+if tenant ~= '' then
+  redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+  redis.call('ZADD', KEYS[3], now + ttl, tenant)
+  redis.call('PEXPIRE', KEYS[3], ttl)
+  local active = redis.call('ZCARD', KEYS[3])
+  tenant_rate, tenant_capacity = rate / active, math.max(1, capacity / active)
+  tenant_tokens = refill(KEYS[4], tenant_rate, tenant_capacity)
+  if tenant_tokens < 1 then wait = math.max(wait, math.ceil((1 - tenant_tokens) / tenant_rate)) end
+end
+
+local member = priority .. ':' .. waiter
+local idle_ms = math.ceil(capacity / rate) * 2
+if wait > 0 then
+  redis.call('ZADD', KEYS[2], now + ttl, member)
+  redis.call('PEXPIRE', KEYS[2], ttl)
+else
+  redis.call('ZREM', KEYS[2], member)
+  tokens = tokens - 1
+  if tenant ~= '' then
+    redis.call('HSET', KEYS[4], 'tokens', tenant_tokens - 1, 'ts', now)
+    redis.call('PEXPIRE', KEYS[4], math.ceil(tenant_capacity / tenant_rate) * 2)
+  end
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], idle_ms)
+return wait
+"""
+
+
+class _LocalBudget:
+    """Per-process version of _ACQUIRE_SCRIPT, used when Redis is not configured."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._waiters = {}
+        self._tenants = {}
+
+    def _refill(self, key, now, rate, capacity):
+        tokens, ts = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + max(0.0, now - ts) * rate)
+
+    def try_acquire(self, rate, capacity, priority, reserve, waiter, ttl, tenant):
+        now = time.time() * 1000
+        with self._lock:
+            self._waiters = {k: v for k, v in self._waiters.items() if v > now}
+            blocked = any(p < priority for p, _ in self._waiters)
+            tokens = self._refill(BUDGET_KEY, now, rate, capacity)
+            wait = 100 if blocked else 0
+            if tokens < 1 + reserve:
+                wait = max(wait, math.ceil((1 + reserve - tokens) / rate))
+            if tenant:
+                self._tenants = {k: v for k, v in self._tenants.items() if v > now}
+                self._tenants[tenant] = now + ttl
+                tenant_rate, tenant_capacity = rate / len(self._tenants), max(1.0, capacity / len(self._tenants))
+                tenant_tokens = self._refill(TENANT_KEY_PREFIX + tenant, now, tenant_rate, tenant_capacity)
+                if tenant_tokens < 1:
+                    wait = max(wait, math.ceil((1 - tenant_tokens) / tenant_rate))
+            if wait:
+                self._waiters[(priority, waiter)] = now + ttl
+            else:
+                self._waiters.pop((priority, waiter), None)
+                tokens -= 1
+                if tenant:
+                    self._buckets[TENANT_KEY_PREFIX + tenant] = (tenant_tokens - 1, now)
+            self._buckets[BUDGET_KEY] = (tokens, now)
+            return wait
+
+    def withdraw(self, priority, waiter):
+        with self._lock:
+            self._waiters.pop((priority, waiter), None)
+
+    def drain(self):
+        with self._lock:
+            self._buckets[BUDGET_KEY] = (0.0, time.time() * 1000)
+
+
+_local_budget = _LocalBudget()
+_acquire_script = None
+
+
+def _try_acquire(priority, waiter, tenant):
+    global _acquire_script
+    from redis_client import get_redis
+    args = (LLM_REQUESTS_PER_MINUTE / 60000.0, LLM_BURST, priority, PRIORITY_RESERVE[priority] * LLM_BURST,
+            waiter, PRESENCE_TTL_MS, tenant)
+    redis_conn = get_redis()
+    if redis_conn is not None:
+        try:
+            if _acquire_script is None:
+                _acquire_script = redis_conn.register_script(_ACQUIRE_SCRIPT)
+            keys = [BUDGET_KEY, WAITERS_KEY, TENANTS_KEY, TENANT_KEY_PREFIX + tenant if tenant else '']
+            return int(_acquire_script(keys=keys, args=args, client=redis_conn))
+        except Exception as e:
+            print(f"LLM SCHEDULER: Redis unavailable, using the per-process budget: {e}")
+    return _local_budget.try_acquire(*args)
+
+
+def _withdraw(priority, waiter):
+    from redis_client import get_redis
+    _local_budget.withdraw(priority, waiter)
+    redis_conn = get_redis()
+    if redis_conn is not None:
+        try:
+            redis_conn.zrem(WAITERS_KEY, f'{priority}:{waiter}')
+        except Exception:
+            pass
+
+
+def _drain():
+    """Empty the shared bucket after a quota error so every process backs off."""
+    from redis_client import get_redis
+    _local_budget.drain()
+    redis_conn = get_redis()
+    if redis_conn is not None:
+        try:
+            redis_conn.hset(BUDGET_KEY, mapping={'tokens': 0, 'ts': int(time.time() * 1000)})
+        except Exception:
+            pass
+
+
+def acquire(priority, tenant=None):
+    """Block until a model call of this priority may start; raise SchedulerBusy on timeout."""
+    if LLM_REQUESTS_PER_MINUTE <= 0:
+        return
+    waiter = uuid.uuid4().hex
+    tenant = str(tenant) if tenant is not None else ''
+    deadline = time.monotonic() + PRIORITY_MAX_WAIT[priority]
+    while True:
+        wait_ms = _try_acquire(priority, waiter, tenant)
+        if not wait_ms:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _withdraw(priority, waiter)
+            raise SchedulerBusy(f'No {PRIORITY_NAMES[priority]} model call slot within '
+                                f'{PRIORITY_MAX_WAIT[priority]:.0f}s')
+        time.sleep(min(wait_ms / 1000.0, MAX_POLL_SECONDS, remaining))
+
+
+def _rate_limited(e):
+    return type(e).__name__ in ('ResourceExhausted', 'TooManyRequests') or '429' in str(e)
+
+
+def generate_content(model, prompt, priority, tenant=None):
+    """model.generate_content(prompt), scheduled against the shared rate budget."""
+    acquire(priority, tenant)
+    try:
+        return model.generate_content(prompt)
+    except Exception as e:
+        if _rate_limited(e):
+            _drain()
+        raise
+
+
+def embed_content(priority, tenant=None, **kwargs):
+    """genai.embed_content(**kwargs), scheduled against the shared rate budget."""
+    import google.generativeai as genai
+    acquire(priority, tenant)
+    try:
+        return genai.embed_content(**kwargs)
+    except Exception as e:
+        if _rate_limited(e):
+            _drain()
+        raise
+
+
+def stream_content(model, prompt, priority, tenant=None):
+    """Streamed generation: yields the response text chunk by chunk as the model produces it.
+
+    Scheduled like generate_content (one request against the budget, taken
+    when iteration starts). Chunks without text, such as a final
+    safety-blocked chunk, are skipped.
+    """
+    acquire(priority, tenant)
+    try:
+        for chunk in model.generate_content(prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                yield text
+    except Exception as e:
+        if _rate_limited(e):
+            _drain()
+        raise
@@ -0,0 +1,83 @@
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+from flask import current_app
+
+
+def send_email(to_email, subject, body, html_body=None):
+    """Send an email via Gmail SMTP.
+    Requires GMAIL_USER and GMAIL_APP_PASSWORD env vars to be set.
+    """
+    gmail_user = current_app.config.get('GMAIL_USER')
+    gmail_password = current_app.config.get('GMAIL_APP_PASSWORD')
+
+    if not gmail_user or not gmail_password:
+        raise RuntimeError(
+            'Gmail SMTP not configured. Set GMAIL_USER and GMAIL_APP_PASSWORD environment variables. '
+            'Get app password from: https://myaccount.google.com/apppasswords'
+        )
+
+    try:
+        # Create message
+        msg = MIMEMultipart('alternative')
+        msg['From'] = gmail_user
+        msg['To'] = to_email
+        msg['Subject'] = subject
+
+        # Add HTML or plain text body
+        if html_body:
+            msg.attach(MIMEText(html_body, 'html'))
+        else:
+            msg.attach(MIMEText(body, 'plain'))
+
+        # Connect to Gmail SMTP server
+        print(f"Sending email via Gmail SMTP: to={to_email}, from={gmail_user}")
+        config = current_app.config
+        smtp_class = smtplib.SMTP_SSL if config.get('SMTP_USE_SSL', True) else smtplib.SMTP
+        with smtp_class(config.get('SMTP_HOST', 'smtp.gmail.com'), config.get('SMTP_PORT', 465)) as server:
+            server.login(gmail_user, gmail_password)
+            server.send_message(msg)
+
+        print(f"Email sent successfully via Gmail to {to_email}")
+        return True
+    except Exception as e:
+        print(f"Gmail SMTP error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+
+def acceptance_email(job_title, company_name):
+    """Subject and HTML body telling a candidate they passed the interview stage."""
+    subject = f"✅ Congratulations! Next Steps for {job_title}"
+    html_body = f"""<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f9fafb;">
+        <div style="background: linear-gradient(135deg, #10b981 0%, #059669 100%); padding: 30px; border-radius: 10px 10px 0 0; text-align: center;">
+            <h1 style="color: white; margin: 0; font-size: 28px;">✅ You're Moving Forward!</h1>
+        </div>
+
+        <div style="background-color: white; padding: 30px; border-radius: 0 0 10px 10px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+            <p style="font-size: 16px; color: #374151; line-height: 1.6;">Dear Candidate,</p>
+
+            <p style="font-size: 16px; color: #374151; line-height: 1.6;">
+                Congratulations! We're impressed with your interview performance for the <strong>{job_title}</strong> position.
+            </p>
+
+            <p style="font-size: 16px; color: #374151; line-height: 1.6;">
+                We would like to invite you to our office for the next round of interviews. Our team will contact you shortly with the details.
+            </p>
+
+            <div style="background-color: #d1fae5; border-left: 4px solid #10b981; padding: 15px; margin: 20px 0; border-radius: 4px;">
+                <p style="margin: 0; color: #065f46; font-size: 14px;">
+                    <strong>🎯 Next Steps:</strong> Keep an eye on your email for scheduling details.
+                </p>
+            </div>
+
+            <p style="font-size: 14px; color: #6b7280; line-height: 1.6;">
+                Looking forward to meeting you!<br>
+                <strong>The {company_name} Hiring Team</strong>
+            </p>
+        </div>
+    </div>
+    """
+    return subject, html_body
@@ -0,0 +1,262 @@
+"""Prometheus-style request metrics, DB pool and queue stats.
+
+Each process records per-route latency histograms and status counts in
+memory. When Redis is configured, every process also publishes a snapshot
+under metrics:worker:<host>:<pid> (short TTL), and /metrics sums the
+snapshots of all live workers. Without this, a scrape would only see the
+one gunicorn worker that happened to serve it.
+"""
+import json
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, jsonify, request
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from redis_client import get_redis
+
+# Seconds; covers fast cached reads through multi-second model calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SNAPSHOT_PREFIX = 'metrics:worker:'
+SNAPSHOT_INTERVAL = 5
+SNAPSHOT_TTL = 60
+# Readiness results are reused for this long so probes don't hit the DB each time
+READINESS_CACHE_SECONDS = float(os.getenv('READINESS_CACHE_SECONDS', 5))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (method, route) -> [bucket counts..., +Inf count], sum
+        self.buckets = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+        self.sums = defaultdict(float)
+        # (method, route, status) -> count
+        self.requests = defaultdict(int)
+        self.pool_timeouts = 0
+        self._last_snapshot = 0.0
+
+    def observe(self, method, route, status, seconds):
+        key = (method, route)
+        with self._lock:
+            counts = self.buckets[key]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self.sums[key] += seconds
+            self.requests[(method, route, str(status))] += 1
+
+    def count_pool_timeout(self):
+        with self._lock:
+            self.pool_timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'buckets': [[list(k), v] for k, v in self.buckets.items()],
+                'sums': [[list(k), v] for k, v in self.sums.items()],
+                'requests': [[list(k), v] for k, v in self.requests.items()],
+                'pool_timeouts': self.pool_timeouts,
+            }
+
+
+registry = Registry()
+_worker_id = f'{socket.gethostname()}:{os.getpid()}'
+
+
+def pool_stats(db):
+    """Checked-out/overflow numbers for the primary engine's pool."""
+    pool = db.engine.pool
+    stats = {'checked_out': 0, 'overflow': 0, 'size': 0,
+             'max_overflow': getattr(pool, '_max_overflow', 0)}
+    for name in ('checkedout', 'overflow', 'size'):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            stats['checked_out' if name == 'checkedout' else name] = fn()
+    return stats
+
+
+def _publish_snapshot(db):
+    now = time.monotonic()
+    if now - registry._last_snapshot < SNAPSHOT_INTERVAL:
+        return
+    registry._last_snapshot = now
+    redis_conn = get_redis()
+    if redis_conn is None:
+        return
+    try:
+        snapshot = registry.snapshot()
+        snapshot['pool'] = pool_stats(db)
+        redis_conn.setex(SNAPSHOT_PREFIX + _worker_id, SNAPSHOT_TTL, json.dumps(snapshot))
+    except Exception as e:
+        print(f"METRICS: snapshot publish failed: {e}")
+
+
+def init_app(app, db):
+    """Register request timing hooks on the app."""
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            registry.observe(request.method, route, response.status_code, time.perf_counter() - start)
+        _publish_snapshot(db)
+        return response
+
+    @app.errorhandler(PoolTimeoutError)
+    def _pool_timeout(e):
+        registry.count_pool_timeout()
+        print(f"METRICS: database pool timeout: {e}")
+        return jsonify({'error': 'Server busy, please retry'}), 503
+
+
+_readiness = {'checked_at': 0.0, 'result': None}
+_readiness_lock = threading.Lock()
+
+
+def readiness(db):
+    """Return (ready, detail), running SELECT 1 at most once per READINESS_CACHE_SECONDS."""
+    with _readiness_lock:
+        now = time.monotonic()
+        if _readiness['result'] is not None and now - _readiness['checked_at'] < READINESS_CACHE_SECONDS:
+            return _readiness['result']
+        try:
+            db.session.execute(text('SELECT 1'))
+            db.session.commit()
+            result = (True, 'connected')
+        except Exception as e:
+            db.session.rollback()
+            result = (False, str(e))
+        _readiness.update(checked_at=now, result=result)
+        return result
+
+
+def _collect_snapshots(db):
+    """Return all live workers' snapshots (just this process without Redis)."""
+    local = registry.snapshot()
+    local['pool'] = pool_stats(db)
+    redis_conn = get_redis()
+    if redis_conn is None:
+        return {_worker_id: local}
+    snapshots = {}
+    try:
+        keys = list(redis_conn.scan_iter(match=SNAPSHOT_PREFIX + '*', count=100))
+        for key, raw in zip(keys, redis_conn.mget(keys) if keys else []):
+            if raw:
+                snapshots[key.decode('utf-8')[len(SNAPSHOT_PREFIX):]] = json.loads(raw)
+    except Exception as e:
+        print(f"METRICS: snapshot collection failed: {e}")
+    # This process's view is always the freshest
+    snapshots[_worker_id] = local
+    return snapshots
+
+
+def _labels(**labels):
+    parts = [f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+             for k, v in labels.items()]
+    return '{' + ','.join(parts) + '}'
+
+
+def queue_stats():
+    """RQ queue depth and worker count, or None without Redis."""
+    redis_conn = get_redis()
+    if redis_conn is None:
+        return None
+    try:
+        from rq import Queue, Worker
+        queue = Queue(connection=redis_conn)
+        return {
+            'queue': queue.name,
+            'depth': queue.count,
+            'failed': queue.failed_job_registry.count,
+            'started': queue.started_job_registry.count,
+            'workers': Worker.count(connection=redis_conn),
+        }
+    except Exception as e:
+        print(f"METRICS: queue stats failed: {e}")
+        return None
+
+
+def render(db):
+    """Render all metrics in the Prometheus text exposition format."""
+    snapshots = _collect_snapshots(db)
+    buckets = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    sums = defaultdict(float)
+    requests_total = defaultdict(int)
+    pool_timeouts = 0
+    for snapshot in snapshots.values():
+        for key, counts in snapshot['buckets']:
+            merged = buckets[tuple(key)]
+            for i, count in enumerate(counts):
+                merged[i] += count
+        for key, value in snapshot['sums']:
+            sums[tuple(key)] += value
+        for key, value in snapshot['requests']:
+            requests_total[tuple(key)] += value
+        pool_timeouts += snapshot.get('pool_timeouts', 0)
+
+    lines = [
+        '# HELP http_request_duration_seconds Request latency by route.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (method, route), counts in sorted(buckets.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, counts):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'http_request_duration_seconds_bucket{_labels(method=method, route=route, le="+Inf")} {cumulative}')
+        lines.append(f'http_request_duration_seconds_sum{_labels(method=method, route=route)} {sums[(method, route)]:.6f}')
+        lines.append(f'http_request_duration_seconds_count{_labels(method=method, route=route)} {cumulative}')
+
+    lines += ['# HELP http_requests_total Requests by route and status code.',
+              '# TYPE http_requests_total counter']
+    for (method, route, status), count in sorted(requests_total.items()):
+        lines.append(f'http_requests_total{_labels(method=method, route=route, status=status)} {count}')
+
+    lines += ['# HELP db_pool_checked_out Connections currently checked out, per worker.',
+              '# TYPE db_pool_checked_out gauge']
+    for worker, snapshot in sorted(snapshots.items()):
+        lines.append(f'db_pool_checked_out{_labels(worker=worker)} {snapshot["pool"]["checked_out"]}')
+    lines += ['# HELP db_pool_overflow Connections open beyond pool_size (negative while below it), per worker.',
+              '# TYPE db_pool_overflow gauge']
+    for worker, snapshot in sorted(snapshots.items()):
+        lines.append(f'db_pool_overflow{_labels(worker=worker)} {snapshot["pool"]["overflow"]}')
+    lines += ['# HELP db_pool_max_overflow Configured max_overflow.',
+              '# TYPE db_pool_max_overflow gauge',
+              f'db_pool_max_overflow {pool_stats(db)["max_overflow"]}',
+              '# HELP db_pool_timeouts_total Requests that gave up waiting for a pooled connection.',
+              '# TYPE db_pool_timeouts_total counter',
+              f'db_pool_timeouts_total {pool_timeouts}']
+
+    queues = queue_stats()
+    if queues:
+        labels = _labels(queue=queues['queue'])
+        lines += ['# HELP rq_queue_depth Jobs waiting in the RQ queue.',
+                  '# TYPE rq_queue_depth gauge',
+                  f'rq_queue_depth{labels} {queues["depth"]}',
+                  '# HELP rq_jobs_started Jobs currently being worked on.',
+                  '# TYPE rq_jobs_started gauge',
+                  f'rq_jobs_started{labels} {queues["started"]}',
+                  '# HELP rq_jobs_failed Jobs in the failed registry.',
+                  '# TYPE rq_jobs_failed gauge',
+                  f'rq_jobs_failed{labels} {queues["failed"]}',
+                  '# HELP rq_workers Registered RQ workers.',
+                  '# TYPE rq_workers gauge',
+                  f'rq_workers {queues["workers"]}']
+
+    lines += ['# HELP app_workers Web worker processes reporting metrics.',
+              '# TYPE app_workers gauge',
+              f'app_workers {len(snapshots)}']
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,161 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from extensions import db
+
+
+# --- Database Models ---
+class Admin(db.Model):
+    __tablename__ = 'admins'
+    id = db.Column(db.Integer, primary_key=True)
+    company_name = db.Column(db.String(255), nullable=False)
+    email = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    phone = db.Column(db.String(20))
+    password = db.Column(db.String(255), nullable=False)
+    jobs = db.relationship('Job', backref='admin', lazy=True, cascade='all, delete-orphan')
+
+class Candidate(db.Model):
+    __tablename__ = 'candidates'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), nullable=False)
+    email = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    password = db.Column(db.String(255), nullable=False)
+    applications = db.relationship('Application', backref='candidate', lazy=True, cascade='all, delete-orphan')
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    admin_id = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=False, index=True)
+    title = db.Column(db.String(255), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    # float32 vector of the description (see embeddings.py); deferred so normal loads skip it
+    embedding = db.deferred(db.Column(db.LargeBinary))
+    embedding_model = db.Column(db.String(64))
+    # open -> closed (no new applications) -> archived (applications moved to archived_applications)
+    status = db.Column(db.String(16), nullable=False, default='open', server_default='open', index=True)
+    closed_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime)
+    applications = db.relationship('Application', backref='job', lazy=True, cascade='all, delete-orphan')
+
+class Application(db.Model):
+    __tablename__ = 'applications'
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False, index=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False, index=True)
+    resume_text = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(50), nullable=False, default='Applied', index=True)
+    shortlist_reason = db.Column(db.Text)
+    report_path = db.Column(db.String(500))
+    # Legacy JSON text blob; kept in sync with interview_data for older readers
+    interview_results = db.Column(db.Text)
+    interview_data = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'))
+    # float32 vector of resume_text (see embeddings.py); deferred so normal loads skip it
+    embedding = db.deferred(db.Column(db.LargeBinary))
+    embedding_model = db.Column(db.String(64))
+    # MinHash signature of resume_text (see dedup.py) and the earliest near-duplicate it copies
+    minhash = db.deferred(db.Column(db.LargeBinary))
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='SET NULL'), index=True)
+    # final_recommendation from the scorecard, kept for ranking without opening the PDF
+    recommendation = db.Column(db.String(32))
+    # The report's scorecard and when the interview finished, so reports can be regenerated (see reports.py)
+    scorecard = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'))
+    completed_at = db.Column(db.DateTime)
+    # Compact resume summary used in prompts (see digest.py) and the hash of the resume it came from
+    resume_digest = db.Column(db.Text)
+    resume_digest_hash = db.Column(db.String(64))
+    # Questions issued by start_interview, so a reconnecting candidate resumes the same interview
+    interview_questions = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'))
+    
+    __table_args__ = (
+        # Add unique constraint to prevent duplicate applications
+        db.UniqueConstraint('candidate_id', 'job_id', name='unique_application'),
+        # Matches filter_by(job_id=..., status=...) used by the dashboards and batch jobs
+        db.Index('ix_applications_job_id_status', 'job_id', 'status'),
+        # Small partial indexes for the two work queues: shortlisting and bulk invites
+        db.Index('ix_applications_job_id_applied', 'job_id', postgresql_where=text("status = 'Applied'")),
+        db.Index('ix_applications_job_id_shortlisted', 'job_id', postgresql_where=text("status = 'Shortlisted'")),
+        db.Index('ix_applications_interview_data', 'interview_data',
+                 postgresql_using='gin', postgresql_ops={'interview_data': 'jsonb_path_ops'}),
+    )
+
+    @property
+    def results(self):
+        """Interview results as Python data, reading JSONB first and falling back to the legacy text column."""
+        if self.interview_data is not None:
+            return self.interview_data
+        if self.interview_results:
+            try:
+                return json.loads(self.interview_results)
+            except ValueError:
+                return None
+        return None
+
+    @results.setter
+    def results(self, value):
+        self.interview_data = value
+        self.interview_results = json.dumps(value) if value is not None else None
+
+class ProctoringEvent(db.Model):
+    """Append-only log of client-reported proctoring events (never updated in place)."""
+    __tablename__ = 'proctoring_events'
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), nullable=False)
+    event_type = db.Column(db.String(32), nullable=False)
+    question_index = db.Column(db.Integer)
+    occurred_at = db.Column(db.DateTime, nullable=False)
+    received_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Rule evaluation counts events per (application, type)
+    __table_args__ = (db.Index('ix_proctoring_events_application_type', 'application_id', 'event_type', 'occurred_at'),)
+
+class ResumeLshBucket(db.Model):
+    """LSH band buckets of application MinHash signatures; equal (band, bucket) means a likely near-duplicate."""
+    __tablename__ = 'resume_lsh_buckets'
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), nullable=False, index=True)
+    band = db.Column(db.SmallInteger, nullable=False)
+    bucket = db.Column(db.BigInteger, nullable=False)
+
+    __table_args__ = (db.Index('ix_resume_lsh_buckets_band_bucket', 'band', 'bucket'),)
+
+class QuestionScore(db.Model):
+    """One scored interview answer; the leaderboard aggregates these in SQL."""
+    __tablename__ = 'question_scores'
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), nullable=False)
+    # Denormalized from the application so per-job aggregation needs no join
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False)
+    question_index = db.Column(db.SmallInteger, nullable=False)
+    question = db.Column(db.Text, nullable=False)
+    answer = db.Column(db.Text)
+    score = db.Column(db.SmallInteger, nullable=False)
+    feedback = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('application_id', 'question_index', name='unique_question_score'),
+        # Covers GROUP BY application_id / question_index for one job as an index-only scan
+        db.Index('ix_question_scores_job_application', 'job_id', 'application_id', 'question_index',
+                 postgresql_include=['score']),
+    )
+
+class ArchivedApplication(db.Model):
+    """An application of an archived job, moved out of the hot tables (see archive.py).
+
+    Only the columns needed to list and filter archived applications are kept
+    as columns; everything else (resume, transcript, scores, proctoring log)
+    is one zlib-compressed JSON document in payload.
+    """
+    __tablename__ = 'archived_applications'
+    # Same id the application had while live, so links and report names stay valid
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False, index=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id', ondelete='CASCADE'), nullable=False, index=True)
+    status = db.Column(db.String(50), nullable=False)
+    recommendation = db.Column(db.String(32))
+    report_path = db.Column(db.String(500))
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    payload = db.deferred(db.Column(db.LargeBinary, nullable=False))
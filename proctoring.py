@@ -0,0 +1,132 @@
+"""Batched proctoring event ingestion and server-side termination rules.
+
+The interview page buffers events (tab switches, multiple faces, loss of
+focus) and posts them in batches. Each batch is debounced, bulk-inserted into
+the append-only proctoring_events table with a single INSERT, and the
+termination rules are evaluated against the per-type totals.
+"""
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert
+
+from extensions import db
+from models import ProctoringEvent
+
+EVENT_TYPES = ('tab_switch', 'multi_face', 'focus_loss')
+
+# Number of recorded events of a type that terminates the interview (None = flag only)
+TERMINATION_LIMITS = {
+    'tab_switch': int(os.getenv('PROCTOR_TAB_SWITCH_LIMIT', 3)),
+    'multi_face': int(os.getenv('PROCTOR_MULTI_FACE_LIMIT', 5)),
+    'focus_loss': None,
+}
+TERMINATION_REASONS = {
+    'tab_switch': 'Excessive tab switching',
+    'multi_face': 'Multiple faces detected repeatedly',
+}
+FLAG_LABELS = {
+    'tab_switch': 'Tab switch',
+    'multi_face': 'Multiple faces detected',
+    'focus_loss': 'Lack of focus',
+}
+
+# Events of the same type closer together than this are treated as one
+DEBOUNCE = timedelta(seconds=1)
+MAX_BATCH_SIZE = 100
+# Client clocks are only trusted within this window
+MAX_CLOCK_SKEW = timedelta(minutes=10)
+
+
+def _event_time(raw_ts, now):
+    """Convert a client epoch-milliseconds timestamp, clamped to a sane window."""
+    try:
+        ts = datetime.utcfromtimestamp(float(raw_ts) / 1000.0)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return now
+    if ts > now or now - ts > MAX_CLOCK_SKEW:
+        return now
+    return ts
+
+
+def event_stats(application_id):
+    """Return {event_type: (count, last_occurred_at)} for an application."""
+    rows = db.session.query(
+        ProctoringEvent.event_type,
+        func.count(ProctoringEvent.id),
+        func.max(ProctoringEvent.occurred_at)
+    ).filter(ProctoringEvent.application_id == application_id).group_by(ProctoringEvent.event_type).all()
+    return {event_type: (count, last) for event_type, count, last in rows}
+
+
+def record_events(application_id, events):
+    """Debounce and bulk-insert a batch of client events.
+
+    Returns (accepted, counts, termination_reason). The caller commits and
+    applies the termination; termination_reason is None if no rule fired.
+    Raises ValueError for a malformed batch.
+    """
+    if not isinstance(events, list):
+        raise ValueError('events must be a list.')
+    if len(events) > MAX_BATCH_SIZE:
+        raise ValueError(f'At most {MAX_BATCH_SIZE} events per batch.')
+
+    now = datetime.utcnow()
+    stats = event_stats(application_id)
+    last_seen = {event_type: last for event_type, (_, last) in stats.items()}
+    counts = {event_type: count for event_type, (count, _) in stats.items()}
+
+    parsed = []
+    for event in events:
+        event_type = event.get('type') if isinstance(event, dict) else None
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f'Unknown event type: {event_type!r}.')
+        question_index = event.get('question_index')
+        parsed.append((
+            _event_time(event.get('ts'), now),
+            event_type,
+            question_index if isinstance(question_index, int) else None,
+        ))
+
+    rows = []
+    for occurred_at, event_type, question_index in sorted(parsed, key=lambda e: e[0]):
+        last = last_seen.get(event_type)
+        if last is not None and occurred_at - last < DEBOUNCE:
+            continue
+        last_seen[event_type] = occurred_at
+        counts[event_type] = counts.get(event_type, 0) + 1
+        rows.append({
+            'application_id': application_id,
+            'event_type': event_type,
+            'question_index': question_index,
+            'occurred_at': occurred_at,
+            'received_at': now,
+        })
+
+    if rows:
+        # executemany: one round-trip for the whole batch
+        db.session.execute(insert(ProctoringEvent), rows)
+
+    termination_reason = None
+    for event_type, limit in TERMINATION_LIMITS.items():
+        if limit is not None and counts.get(event_type, 0) >= limit:
+            termination_reason = TERMINATION_REASONS[event_type]
+            break
+    return len(rows), counts, termination_reason
+
+
+def proctoring_flags(application_id):
+    """Human-readable flags for the report, built from the event log."""
+    events = db.session.query(
+        ProctoringEvent.event_type,
+        ProctoringEvent.question_index,
+        ProctoringEvent.occurred_at
+    ).filter(ProctoringEvent.application_id == application_id).order_by(ProctoringEvent.occurred_at).all()
+    flags = []
+    for event_type, question_index, occurred_at in events:
+        label = FLAG_LABELS.get(event_type, event_type)
+        if question_index is not None:
+            flags.append(f"Q{question_index + 1}: {label}")
+        else:
+            flags.append(f"{label} at {occurred_at.isoformat()}")
+    return flags
@@ -0,0 +1,42 @@
+import os
+
+# redis-py is imported on first use: processes without REDIS_URL never load it.
+# A single connection pool per process. redis-py resets the pool automatically
+# after a fork, so gunicorn workers and RQ work-horses each get their own sockets.
+_pool = None
+
+
+def get_redis():
+    """Return a Redis client backed by the process-wide connection pool.
+
+    Returns None when REDIS_URL is not configured so callers can degrade
+    gracefully (e.g. skip caching) instead of failing the request.
+    """
+    global _pool
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        return None
+    from redis import ConnectionPool, Redis
+    if _pool is None:
+        _pool = ConnectionPool.from_url(
+            redis_url,
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 20)),
+            socket_timeout=5,
+            socket_connect_timeout=5,
+            health_check_interval=30,
+        )
+    return Redis(connection_pool=_pool)
+
+
+def new_pubsub():
+    """Return a PubSub on its own connection, outside the shared pool.
+
+    Subscriptions hold their connection for as long as a stream is open, so
+    they must not eat into the pool used by short request-scoped commands.
+    """
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        return None
+    from redis import Redis
+    return Redis.from_url(redis_url, socket_connect_timeout=5, health_check_interval=30).pubsub(
+        ignore_subscribe_messages=True)
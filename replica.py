@@ -0,0 +1,170 @@
+"""Optional read replica for the read-only dashboard endpoints.
+
+With DATABASE_REPLICA_URL set, the app gets a second engine (the 'replica'
+bind). Views decorated with @read_only run their queries there; every other
+view, and any flush or INSERT/UPDATE/DELETE, uses the primary.
+
+After a request that writes to the primary, the user's session sticks to the
+primary for REPLICA_STICKY_SECONDS, so they read their own writes despite
+replication lag. Reads fall back to the primary when the replica is
+unreachable or (on PostgreSQL) more than REPLICA_MAX_LAG_SECONDS behind; it
+is tried again after REPLICA_RETRY_SECONDS. A read that fails on the replica
+mid-request is answered from the primary. Cache misses in those views load
+from the replica too; only explicit refreshes, which follow a change the
+client was told about, go to the primary (see cache.cached()).
+
+Locally, point DATABASE_URL and DATABASE_REPLICA_URL at two Postgres
+instances (or two SQLite files, copying the first over the second to
+"replicate").
+"""
+import functools
+import os
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+REPLICA_BIND = 'replica'
+REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', 10))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 30))
+REPLICA_RETRY_SECONDS = float(os.getenv('REPLICA_RETRY_SECONDS', 30))
+# A healthy replica's reachability and lag are re-checked at most this often per process
+REPLICA_CHECK_SECONDS = 5
+# Flask session key holding the time of the user's last write
+WRITE_MARK_KEY = '_db_write_at'
+
+# Seconds behind the primary; 0 when the standby has replayed everything it received
+# (an idle primary would otherwise look like growing lag), NULL when not a standby
+_POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_health = {'down_until': 0.0, 'checked_at': None}
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica while a @read_only view is running."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _reading_from_replica() and not self._flushing and not getattr(clause, 'is_dml', False):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _reading_from_replica():
+    return has_request_context() and g.get('_use_replica', False)
+
+
+@contextmanager
+def on_primary():
+    """Run the enclosed queries on the primary, even inside a @read_only view."""
+    previous = g.get('_use_replica', False) if has_request_context() else False
+    if previous:
+        g._use_replica = False
+    try:
+        yield
+    finally:
+        if previous:
+            g._use_replica = True
+
+
+def _mark_write():
+    if has_request_context():
+        g._db_wrote = True
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(db_session, flush_context):
+    _mark_write()
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _after_execute(orm_execute_state):
+    # Bulk statements (db.session.execute(update(...))) don't flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_write()
+
+
+def _mark_down(reason):
+    _health['down_until'] = time.monotonic() + REPLICA_RETRY_SECONDS
+    _health['checked_at'] = None
+    # DBAPI errors carry the failed SQL; the driver's message is enough here
+    print(f"REPLICA: using the primary for {REPLICA_RETRY_SECONDS:.0f}s: {getattr(reason, 'orig', reason)}")
+
+
+def replica_lag(connection):
+    """Seconds the replica is behind, or None if unknown (SQLite, or not a standby)."""
+    if connection.dialect.name != 'postgresql':
+        connection.execute(text('SELECT 1'))
+        return None
+    lag = connection.execute(_POSTGRES_LAG_SQL).scalar()
+    return float(lag) if lag is not None else None
+
+
+def replica_available(engine):
+    """True if reads may go to the replica now (cached for REPLICA_CHECK_SECONDS)."""
+    now = time.monotonic()
+    if now < _health['down_until']:
+        return False
+    if _health['checked_at'] is not None and now - _health['checked_at'] < REPLICA_CHECK_SECONDS:
+        return True
+    try:
+        with engine.connect() as connection:
+            lag = replica_lag(connection)
+    except DBAPIError as e:
+        _mark_down(e)
+        return False
+    if lag is not None and lag > REPLICA_MAX_LAG_SECONDS:
+        _mark_down(f'{lag:.1f}s behind the primary')
+        return False
+    _health['checked_at'] = now
+    return True
+
+
+def _use_replica():
+    engine = current_app.extensions['sqlalchemy'].engines.get(REPLICA_BIND)
+    if engine is None:
+        return False
+    if time.time() - session.get(WRITE_MARK_KEY, 0) < REPLICA_STICKY_SECONDS:
+        return False
+    return replica_available(engine)
+
+
+def read_only(view):
+    """Route a view's queries to the read replica, if one is configured and usable."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _use_replica():
+            return view(*args, **kwargs)
+        g._use_replica = True
+        try:
+            return view(*args, **kwargs)
+        except OperationalError as e:
+            # Replica went away (or cancelled the query during recovery): answer from the primary
+            _mark_down(e)
+            current_app.extensions['sqlalchemy'].session.rollback()
+            g._use_replica = False
+            return view(*args, **kwargs)
+        finally:
+            g._use_replica = False
+    return wrapper
+
+
+def init_app(app):
+    """Remember writes in the user's session so their next reads stay on the primary."""
+    if not app.config.get('SQLALCHEMY_BINDS', {}).get(REPLICA_BIND):
+        return
+
+    @app.after_request
+    def _stick_to_primary(response):
+        # An empty session was just cleared (logout, finished interview); don't save one for the mark
+        if g.get('_db_wrote') and session:
+            session[WRITE_MARK_KEY] = time.time()
+        return response
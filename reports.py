@@ -0,0 +1,254 @@
+"""Candidate performance reports: the AI scorecard and its PDF.
+
+Paragraph styles and page setup are built once per process and reused for
+every report, instead of a fresh getSampleStyleSheet() and four
+ParagraphStyles per PDF. regenerate_reports() rebuilds the reports of
+finished interviews from their stored transcripts, across a process pool, so
+a layout or scorecard prompt change can be applied without re-running
+interviews. Stored scorecards are reused unless a rescore is asked for.
+"""
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+from config import REPORT_FOLDER
+from digest import JOB_PROMPT_TOKENS, fit_budget
+from extensions import db, release_connection
+from llm import BULK, SCORECARD, get_model, stream_content
+from models import Application, Job
+from proctoring import proctoring_flags
+from streaming import first_json_object
+
+SCORECARD_KEYS = ('overall_summary', 'strengths', 'areas_for_improvement', 'final_recommendation')
+# Statuses of finished interviews (Accepted/Rejected are decided after completion). Rejected also
+# covers shortlisting rejections that never reached an interview, so queries require a transcript too.
+REPORTED_STATUSES = ('Completed', 'Accepted', 'Rejected')
+# Applications handed to a pool worker at a time; each chunk commits once
+REGENERATE_CHUNK = int(os.getenv('REGENERATE_CHUNK', 25))
+
+_layout = None
+
+
+def _get_layout():
+    """Styles and page setup shared by every report in this process (reportlab is imported on first use)."""
+    global _layout
+    if _layout is None:
+        from reportlab.lib.colors import navy, red
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+        normal = getSampleStyleSheet()['Normal']
+        _layout = {
+            'page': {'pagesize': letter, 'leftMargin': 72, 'rightMargin': 72, 'topMargin': 72, 'bottomMargin': 72},
+            'normal': normal,
+            'title': ParagraphStyle(name='TitleStyle', fontName='Helvetica-Bold', fontSize=24, alignment=TA_CENTER,
+                                    spaceAfter=20),
+            'heading': ParagraphStyle(name='Heading1Style', fontName='Helvetica-Bold', fontSize=16, spaceBefore=12,
+                                      spaceAfter=6, textColor=navy),
+            'bullet': ParagraphStyle(name='BulletStyle', leftIndent=20, spaceBefore=2),
+            'warning': ParagraphStyle(name='WarningStyle', leftIndent=20, spaceBefore=2, textColor=red),
+        }
+    return _layout
+
+
+def render_report_pdf(scorecard_data, flags):
+    """Render the candidate performance report and return the PDF bytes."""
+    from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer
+
+    layout = _get_layout()
+    normal, heading, bullet = layout['normal'], layout['heading'], layout['bullet']
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, **layout['page'])
+
+    story = [Paragraph("Candidate Performance Report", layout['title'])]
+    story.append(Paragraph("Overall Summary", heading))
+    story.append(Paragraph(escape(str(scorecard_data.get('overall_summary', 'N/A'))), normal))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Key Strengths", heading))
+    for s in scorecard_data.get('strengths', []): story.append(Paragraph(f"• {escape(str(s))}", bullet))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Areas for Improvement", heading))
+    for a in scorecard_data.get('areas_for_improvement', []): story.append(Paragraph(f"• {escape(str(a))}", bullet))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Final Recommendation", heading))
+    story.append(Paragraph(f"<b>{escape(str(scorecard_data.get('final_recommendation', 'N/A')))}</b>", normal))
+
+    if flags:
+        story.append(Spacer(1, 12)); story.append(HRFlowable(width="100%"))
+        story.append(Paragraph("Proctoring Flags", heading))
+        for flag in sorted(set(flags)): story.append(Paragraph(f"• {escape(flag)}", layout['warning']))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def report_file(application_id):
+    return os.path.join(REPORT_FOLDER, f'report_application_{application_id}.pdf')
+
+
+def save_report(application_id, pdf_bytes):
+    """Write a report PDF and return its path. The file is replaced atomically, so a
+    download running during a regeneration never sees a half-written PDF."""
+    os.makedirs(REPORT_FOLDER, exist_ok=True)
+    path = report_file(application_id)
+    partial = f'{path}.{os.getpid()}.tmp'
+    with open(partial, 'wb') as f: f.write(pdf_bytes)
+    os.replace(partial, path)
+    return path
+
+
+def fallback_scorecard(interview_results):
+    avg_score = _average(interview_results)
+    return {
+        'overall_summary': f'Candidate completed the interview with an average score of {avg_score:.1f}/10.',
+        'strengths': ['Completed all interview questions'],
+        'areas_for_improvement': ['Further evaluation recommended'],
+        'final_recommendation': 'Review Required'
+    }
+
+
+def _average(interview_results):
+    return sum(r.get('score', 0) for r in interview_results) / len(interview_results) if interview_results else 0
+
+
+def scorecard_prompt(job_requirements, interview_results):
+    formatted_results = "\n".join([
+        f"Q: {r.get('question', 'N/A')}\nA: {r.get('answer', 'N/A')}\nScore: {r.get('score', 0)}/10\nFeedback: {r.get('feedback', 'N/A')}\n"
+        for r in interview_results
+    ])
+    return f"""Act as a senior hiring manager. Analyze this interview performance and provide a comprehensive evaluation.
+
+**Job Requirements:**
+{fit_budget(job_requirements, JOB_PROMPT_TOKENS)}
+
+**Interview Transcript & Evaluation:**
+{formatted_results[:3000]}
+
+**Average Score:** {_average(interview_results):.1f}/10
+
+Provide a JSON scorecard with exactly these keys:
+- "overall_summary": A 2-3 sentence summary of performance
+- "strengths": Array of 2-4 key strengths demonstrated
+- "areas_for_improvement": Array of 2-4 areas needing development
+- "final_recommendation": One of ["Strongly Recommend", "Recommend", "Consider", "Not Recommended"]
+
+Return only valid JSON, no markdown."""
+
+
+def build_scorecard(job_requirements, interview_results, priority=SCORECARD):
+    """AI scorecard for an interview transcript, or the fallback scorecard if the model is unavailable or fails."""
+    model = get_model()
+    if model:
+        try:
+            # Streamed, and read only until the JSON object closes
+            ai_scorecard = first_json_object(
+                stream_content(model, scorecard_prompt(job_requirements, interview_results), priority))
+            if all(key in ai_scorecard for key in SCORECARD_KEYS):
+                return ai_scorecard
+        except Exception as e:
+            print(f"Error generating AI scorecard: {e}. Using fallback.")
+    return fallback_scorecard(interview_results)
+
+
+def regeneration_ids(job_id=None, since=None, until=None):
+    """Ids of finished interviews to regenerate, optionally limited to a job and a completion date range."""
+    query = db.session.query(Application.id).filter(Application.status.in_(REPORTED_STATUSES),
+                                                    Application.interview_data.isnot(None))
+    if job_id is not None:
+        query = query.filter(Application.job_id == job_id)
+    if since is not None:
+        query = query.filter(Application.completed_at >= since)
+    if until is not None:
+        query = query.filter(Application.completed_at < until)
+    return [row.id for row in query.order_by(Application.id)]
+
+
+def regenerate_chunk(application_ids, rescore=False):
+    """Rebuild the reports of these applications. Runs inside an app context; returns (regenerated, failed)."""
+    regenerated = failed = 0
+    for application_id in application_ids:
+        application = db.session.get(Application, application_id)
+        results = application.results if application else None
+        if not isinstance(results, list) or not results:
+            failed += 1
+            continue
+        scorecard = None if rescore else application.scorecard
+        flags = proctoring_flags(application_id)
+        if scorecard is None:
+            job_requirements = db.session.query(Job.description).filter(Job.id == application.job_id).scalar()
+            release_connection()
+            scorecard = build_scorecard(job_requirements or 'N/A', results, BULK)
+        try:
+            path = save_report(application_id, render_report_pdf(scorecard, flags))
+        except Exception as e:
+            print(f"REPORTS: could not render report for application {application_id}: {e}")
+            failed += 1
+            continue
+        application = db.session.get(Application, application_id)
+        application.report_path = path
+        application.scorecard = scorecard
+        application.recommendation = str(scorecard.get('final_recommendation') or '')[:32] or None
+        regenerated += 1
+    db.session.commit()
+    return regenerated, failed
+
+
+_worker_app = None
+
+
+def _init_worker():
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app()
+
+
+def _run_chunk(application_ids, rescore):
+    with _worker_app.app_context():
+        return regenerate_chunk(application_ids, rescore)
+
+
+def regenerate_reports(job_id=None, since=None, until=None, rescore=False, workers=None, progress=None):
+    """Regenerate report PDFs for finished interviews across a pool of worker processes.
+
+    Must run inside an app context. workers defaults to the CPU count; 1 renders
+    in this process. progress, if given, is called with (done, total) after
+    every chunk. Returns {'total', 'regenerated', 'failed', 'seconds'}.
+    """
+    from cache import admin_jobs_key, invalidate
+
+    started = time.perf_counter()
+    ids = regeneration_ids(job_id, since, until)
+    admin_ids = [row.admin_id for row in db.session.query(Job.admin_id).join(
+        Application, Application.job_id == Job.id).filter(Application.id.in_(ids)).distinct()] if ids else []
+    release_connection()
+
+    chunks = [ids[i:i + REGENERATE_CHUNK] for i in range(0, len(ids), REGENERATE_CHUNK)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks) or 1))
+    regenerated = failed = done = 0
+    if workers == 1:
+        outcomes = (regenerate_chunk(chunk, rescore) for chunk in chunks)
+        executor = None
+    else:
+        # spawn: forked children would share the parent's pooled database connections
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker)
+        outcomes = executor.map(_run_chunk, chunks, [rescore] * len(chunks))
+    try:
+        for chunk, (chunk_regenerated, chunk_failed) in zip(chunks, outcomes):
+            regenerated += chunk_regenerated
+            failed += chunk_failed
+            done += len(chunk)
+            if progress is not None:
+                progress(done, len(ids))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    for admin_id in admin_ids:
+        invalidate(admin_jobs_key(admin_id))
+    return {'total': len(ids), 'regenerated': regenerated, 'failed': failed,
+            'seconds': round(time.perf_counter() - started, 2)}
@@ -0,0 +1,109 @@
+"""Fast JSON serialization and compressed responses.
+
+OrjsonProvider replaces Flask's json-module provider when orjson is
+installed; output is the same JSON (dates still use Flask's HTTP-date
+format), produced several times faster. init_app() compresses responses of
+at least COMPRESS_MIN_BYTES with brotli (if installed) or gzip, whichever the
+client prefers in Accept-Encoding. Streams (SSE) and binary downloads such as
+report PDFs are sent as they are.
+"""
+import gzip
+import os
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+# Fast settings: these responses are built per request, not served from disk
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'text/html', 'text/plain', 'text/css', 'text/javascript',
+    'application/javascript', 'image/svg+xml',
+}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, falling back to the json module for
+    anything orjson can't encode (e.g. integers over 64 bits)."""
+
+    def _options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _dumps_bytes(self, obj, indent=False):
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options(indent))
+        except TypeError:
+            dump_args = {'indent': 2} if indent else {'separators': (',', ':')}
+            return super().dumps(obj, **dump_args).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+def _encoding_for(response):
+    """The Content-Encoding to apply to response, or None to send it as is."""
+    if response.direct_passthrough or response.is_streamed:
+        return None
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return None
+    if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return None
+    if response.content_length is not None and response.content_length < COMPRESS_MIN_BYTES:
+        return None
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def init_app(app):
+    """Install the orjson provider (if available) and response compression on the app."""
+    if orjson is not None:
+        app.json_provider_class = OrjsonProvider
+        app.json = OrjsonProvider(app)
+
+    @app.after_request
+    def _compress(response):
+        if response.mimetype in COMPRESSIBLE_MIMETYPES:
+            response.vary.add('Accept-Encoding')
+        encoding = _encoding_for(response)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,28 @@
+import io
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+
+def is_supported_resume(filename):
+    return bool(filename) and filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def extract_resume_text(filename, data):
+    """Extract plain text from a PDF or DOCX file's bytes.
+
+    PyPDF2 and python-docx are imported on first use to keep startup fast.
+    Raises ValueError for unsupported file types.
+    """
+    text = ""
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+        for page in pdf_reader.pages: text += page.extract_text() or ""
+    elif name.endswith('.docx'):
+        import docx
+        doc = docx.Document(io.BytesIO(data))
+        for para in doc.paragraphs: text += para.text + '\n'
+    else:
+        raise ValueError('Unsupported file type.')
+    return text
@@ -0,0 +1,109 @@
+"""Idempotent schema upgrades for databases created before a model change.
+
+db.create_all() only creates missing tables; it never adds columns or indexes
+to tables that already exist. Every statement here is safe to re-run.
+"""
+import time
+
+from sqlalchemy import text
+
+# Statements are run in autocommit mode so indexes can be built CONCURRENTLY
+# without locking the live applications table.
+POSTGRES_UPGRADES = [
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS interview_data JSONB",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_applications_job_id_status "
+    "ON applications (job_id, status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_applications_job_id_applied "
+    "ON applications (job_id) WHERE status = 'Applied'",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_applications_job_id_shortlisted "
+    "ON applications (job_id) WHERE status = 'Shortlisted'",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_applications_interview_data "
+    "ON applications USING gin (interview_data jsonb_path_ops)",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS embedding BYTEA",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(64)",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS embedding BYTEA",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(64)",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS minhash BYTEA",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS duplicate_of_id INTEGER "
+    "REFERENCES applications (id) ON DELETE SET NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_applications_duplicate_of_id "
+    "ON applications (duplicate_of_id)",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS recommendation VARCHAR(32)",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS interview_questions JSONB",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS resume_digest TEXT",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS resume_digest_hash VARCHAR(64)",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS status VARCHAR(16) NOT NULL DEFAULT 'open'",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS closed_at TIMESTAMP",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS archived_at TIMESTAMP",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_status ON jobs (status)",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS scorecard JSONB",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP",
+    # Payloads are zlib-compressed already; store them out of line without a second TOAST compression pass
+    "ALTER TABLE archived_applications ALTER COLUMN payload SET STORAGE EXTERNAL",
+    # Backfill JSONB from the legacy text column
+    "UPDATE applications SET interview_data = interview_results::jsonb "
+    "WHERE interview_data IS NULL AND interview_results IS NOT NULL",
+    # Backfill per-question scores from interview transcripts written before question_scores existed
+    "INSERT INTO question_scores (application_id, job_id, question_index, question, answer, score, feedback, created_at) "
+    "SELECT a.id, a.job_id, (r.ordinality - 1)::smallint, COALESCE(r.value->>'question', ''), r.value->>'answer', "
+    "CASE WHEN r.value->>'score' ~ '^-?[0-9]+(\\.[0-9]+)?$' "
+    "THEN LEAST(10, GREATEST(0, round((r.value->>'score')::numeric)))::smallint ELSE 0 END, "
+    "r.value->>'feedback', now() "
+    "FROM applications a CROSS JOIN LATERAL jsonb_array_elements("
+    "CASE WHEN jsonb_typeof(a.interview_data) = 'array' THEN a.interview_data ELSE '[]'::jsonb END"
+    ") WITH ORDINALITY AS r(value, ordinality) "
+    "WHERE a.interview_data IS NOT NULL "
+    "AND NOT EXISTS (SELECT 1 FROM question_scores q WHERE q.application_id = a.id) "
+    "ON CONFLICT (application_id, question_index) DO NOTHING",
+    # 0 scores for questions that interviews finished before record_unanswered() existed left unanswered
+    "INSERT INTO question_scores (application_id, job_id, question_index, question, answer, score, feedback, created_at) "
+    "SELECT a.id, a.job_id, (q.ordinality - 1)::smallint, q.value #>> '{}', NULL, 0, 'No answer was recorded.', now() "
+    "FROM applications a CROSS JOIN LATERAL jsonb_array_elements("
+    "CASE WHEN jsonb_typeof(a.interview_questions) = 'array' THEN a.interview_questions ELSE '[]'::jsonb END"
+    ") WITH ORDINALITY AS q(value, ordinality) "
+    "WHERE a.status IN ('Completed', 'Accepted', 'Rejected') "
+    "AND EXISTS (SELECT 1 FROM question_scores s WHERE s.application_id = a.id) "
+    "ON CONFLICT (application_id, question_index) DO NOTHING",
+    # Near-duplicate links across companies, made before dedup matching was scoped to one admin
+    "UPDATE applications a SET duplicate_of_id = NULL "
+    "FROM jobs j, applications r, jobs rj "
+    "WHERE a.duplicate_of_id = r.id AND j.id = a.job_id AND rj.id = r.job_id AND j.admin_id <> rj.admin_id",
+    # Interviews finished before completed_at existed: take the time of the last scored answer
+    "UPDATE applications a SET completed_at = q.last_answer "
+    "FROM (SELECT application_id, max(created_at) AS last_answer FROM question_scores GROUP BY application_id) q "
+    "WHERE q.application_id = a.id AND a.completed_at IS NULL "
+    "AND a.status IN ('Completed', 'Accepted', 'Rejected')",
+]
+
+
+def upgrade_schema(db):
+    """Bring an existing database up to date with the current models."""
+    engine = db.engine
+    if engine.dialect.name != 'postgresql':
+        return
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for statement in POSTGRES_UPGRADES:
+            conn.execute(text(statement))
+    print("Database schema upgrade complete.")
+
+
+# Create database tables with retry logic
+def init_db(db, retries=5, delay=2):
+    """Create missing tables and apply upgrades. Must run inside an app context.
+
+    Invoked explicitly via `flask --app app init-db` (once per deploy), never
+    at import time, so a database outage cannot stall web or worker boot.
+    """
+    for attempt in range(retries):
+        try:
+            db.create_all()
+            upgrade_schema(db)
+            print("Database tables created successfully!")
+            return
+        except Exception as e:
+            if attempt + 1 == retries:
+                print(f"Failed to create database tables after {retries} attempts: {e}")
+                raise
+            print(f"Database initialization attempt {attempt + 1} failed, retrying in {delay} seconds...")
+            time.sleep(delay)
+            delay *= 2  # Exponential backoff
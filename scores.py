@@ -0,0 +1,157 @@
+"""Per-question interview scores and the per-job leaderboard built from them.
+
+Scores are stored one row per answered question (question_scores) so ranking
+candidates is a GROUP BY in the database rather than parsing every
+application's transcript blob in Python.
+"""
+from sqlalchemy import func, insert
+
+from extensions import db
+from models import Application, Candidate, QuestionScore
+
+LEADERBOARD_SORTS = ('average', 'min')
+# Interviews that are over; only these are ranked (Accepted/Rejected are decided after completion)
+FINISHED_STATUSES = ('Completed', 'Accepted', 'Rejected')
+# No more answers are taken once an interview is in one of these
+ENDED_STATUSES = FINISHED_STATUSES + ('Terminated',)
+UNANSWERED_FEEDBACK = 'No answer was recorded.'
+MAX_PER_PAGE = 100
+
+
+def clamp_score(value):
+    """Coerce a model-supplied score to an int in 0..10."""
+    try:
+        return max(0, min(10, int(round(float(value)))))
+    except (TypeError, ValueError):
+        return 0
+
+
+def record_answer(application_id, job_id, question_index, question, answer, score, feedback):
+    """Store the scored answer for one question as it happens. The caller commits.
+
+    Each question is answered once: a second answer to the same question fails
+    the commit on unique_question_score, so a candidate can't retry for a
+    better score.
+    """
+    db.session.add(QuestionScore(application_id=application_id, job_id=job_id, question_index=question_index,
+                                 question=question, answer=answer, score=clamp_score(score), feedback=feedback))
+
+
+def is_answered(application_id, question_index):
+    return db.session.query(QuestionScore.id).filter_by(
+        application_id=application_id, question_index=question_index).first() is not None
+
+
+def answered_questions(application_id):
+    """Stored answers for an application, ordered by question index."""
+    return QuestionScore.query.filter_by(application_id=application_id).order_by(QuestionScore.question_index).all()
+
+
+def record_unanswered(application_id, job_id, questions, answers):
+    """Store a 0 score for every question the finished interview left unanswered. The caller commits."""
+    answered = {row.question_index for row in answers}
+    rows = [{
+        'application_id': application_id,
+        'job_id': job_id,
+        'question_index': index,
+        'question': str(question),
+        'answer': None,
+        'score': 0,
+        'feedback': UNANSWERED_FEEDBACK,
+    } for index, question in enumerate(questions or []) if index not in answered]
+    if rows:
+        db.session.execute(insert(QuestionScore), rows)
+
+
+def assemble_transcript(questions, answers):
+    """Full transcript in the interview_results format; unanswered questions score 0."""
+    by_index = {row.question_index: row for row in answers}
+    count = max(len(questions or []), max(by_index, default=-1) + 1)
+    transcript = []
+    for index in range(count):
+        row = by_index.get(index)
+        if row is not None:
+            transcript.append({'question': row.question, 'answer': row.answer,
+                               'score': row.score, 'feedback': row.feedback})
+        else:
+            transcript.append({'question': questions[index] if index < len(questions or []) else 'N/A',
+                               'answer': 'No answer recorded.', 'score': 0,
+                               'feedback': UNANSWERED_FEEDBACK})
+    return transcript
+
+
+def leaderboard(job_id, page=1, per_page=25, sort='average'):
+    """Rank a job's finished interviews by their per-question scores.
+
+    Interviews still in progress are left out; finished ones carry a 0 for
+    every unanswered question (see record_unanswered). One aggregate query ranks and pages the candidates; a second fetches the
+    per-question scores of just that page; a third summarizes each question
+    across the whole job.
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    page = max(1, page)
+
+    average = func.avg(QuestionScore.score).label('average_score')
+    minimum = func.min(QuestionScore.score).label('min_score')
+    answered = func.count(QuestionScore.answer).label('questions_answered')
+    finished = db.session.query(Application.id).filter(
+        Application.job_id == job_id, Application.status.in_(FINISHED_STATUSES))
+    ranked = db.session.query(
+        QuestionScore.application_id, average, minimum, func.max(QuestionScore.score).label('max_score'), answered
+    ).filter(QuestionScore.job_id == job_id, QuestionScore.application_id.in_(finished)).group_by(
+        QuestionScore.application_id).subquery()
+
+    total = db.session.query(func.count()).select_from(ranked).scalar()
+    order = (ranked.c.min_score.desc(), ranked.c.average_score.desc()) if sort == 'min' else \
+        (ranked.c.average_score.desc(), ranked.c.min_score.desc())
+    rows = db.session.query(
+        ranked, Candidate.name, Candidate.email, Application.status, Application.recommendation
+    ).join(Application, Application.id == ranked.c.application_id).join(
+        Candidate, Candidate.id == Application.candidate_id
+    ).order_by(*order, ranked.c.application_id).limit(per_page).offset((page - 1) * per_page).all()
+
+    breakdown = {}
+    if rows:
+        for score in db.session.query(
+            QuestionScore.application_id, QuestionScore.question_index, QuestionScore.score
+        ).filter(QuestionScore.application_id.in_([row.application_id for row in rows])).order_by(
+            QuestionScore.application_id, QuestionScore.question_index
+        ):
+            breakdown.setdefault(score.application_id, []).append(
+                {'question_index': score.question_index, 'score': score.score})
+
+    question_stats = db.session.query(
+        QuestionScore.question_index,
+        func.avg(QuestionScore.score).label('average_score'),
+        func.min(QuestionScore.score).label('min_score'),
+        func.count(QuestionScore.answer).label('answered')
+    ).filter(QuestionScore.job_id == job_id, QuestionScore.application_id.in_(finished)).group_by(QuestionScore.question_index).order_by(
+        QuestionScore.question_index).all()
+
+    offset = (page - 1) * per_page
+    return {
+        'job_id': job_id,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'sort': sort,
+        'candidates': [{
+            'rank': offset + position,
+            'application_id': row.application_id,
+            'candidate_name': row.name,
+            'candidate_email': row.email,
+            'status': row.status,
+            'recommendation': row.recommendation,
+            'average_score': round(float(row.average_score), 2),
+            'min_score': row.min_score,
+            'max_score': row.max_score,
+            'questions_answered': row.questions_answered,
+            'scores': breakdown.get(row.application_id, []),
+        } for position, row in enumerate(rows, start=1)],
+        'question_stats': [{
+            'question_index': stat.question_index,
+            'average_score': round(float(stat.average_score), 2),
+            'min_score': stat.min_score,
+            'answered': stat.answered,
+        } for stat in question_stats],
+    }
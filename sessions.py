@@ -0,0 +1,111 @@
+"""Server-side Flask sessions stored in Redis.
+
+The cookie only carries an opaque random session id; the session data itself
+(including interview state and proctoring flags) lives in Redis under
+`session:<sid>` with a TTL of PERMANENT_SESSION_LIFETIME, renewed on every
+request, so the lifetime counts from the user's last activity. This keeps
+request payloads small and lets any gunicorn worker serve any request.
+"""
+import secrets
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from redis_client import get_redis
+
+KEY_PREFIX = 'session:'
+
+
+class RedisSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.replaced_sid = None
+
+    def regenerate(self):
+        """Move the session to a fresh id, dropping the old one (call at login against session fixation)."""
+        if self.replaced_sid is None and not self.new:
+            self.replaced_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+def regenerate_session(session):
+    """Give the current session a new id; cookie-only sessions have none, so nothing to do there."""
+    if isinstance(session, RedisSession):
+        session.regenerate()
+
+
+class RedisSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+
+    def _new_session(self):
+        return RedisSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid:
+            return self._new_session()
+        try:
+            raw = get_redis().get(KEY_PREFIX + sid)
+        except Exception as e:
+            print(f"SESSION: redis load failed: {e}")
+            return self._new_session()
+        if raw is None:
+            # Expired or unknown id: never adopt a client-chosen id.
+            return self._new_session()
+        try:
+            return RedisSession(self.serializer.loads(raw.decode('utf-8')), sid=sid)
+        except Exception as e:
+            print(f"SESSION: corrupt session payload discarded: {e}")
+            return self._new_session()
+
+    def save_session(self, app, session, response):
+        cookie_name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified:
+                try:
+                    get_redis().delete(*[KEY_PREFIX + sid for sid in (session.sid, session.replaced_sid) if sid])
+                except Exception as e:
+                    print(f"SESSION: redis delete failed: {e}")
+                response.delete_cookie(cookie_name, domain=domain, path=path)
+            return
+
+        lifetime = int(app.permanent_session_lifetime.total_seconds())
+        if not self.should_set_cookie(app, session):
+            # Unchanged: keep the data alive for another lifetime, no rewrite or cookie needed
+            try:
+                get_redis().expire(KEY_PREFIX + session.sid, lifetime)
+            except Exception as e:
+                print(f"SESSION: redis expire failed: {e}")
+            return
+
+        try:
+            pipe = get_redis().pipeline()
+            pipe.setex(KEY_PREFIX + session.sid, lifetime, self.serializer.dumps(dict(session)))
+            if session.replaced_sid:
+                pipe.delete(KEY_PREFIX + session.replaced_sid)
+            pipe.execute()
+        except Exception as e:
+            print(f"SESSION: redis save failed: {e}")
+            return
+
+        response.set_cookie(
+            cookie_name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
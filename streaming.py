@@ -0,0 +1,129 @@
+"""Incremental parsing of streamed model output.
+
+Models stream JSON a few tokens at a time. JsonArrayStream pulls the elements
+of the first JSON array out of that text as soon as each one is complete, so
+a caller can act on the first interview question while the rest are still
+being generated. first_json_object() reads a stream only until one complete
+top-level object has arrived.
+"""
+import json
+
+
+class JsonArrayStream:
+    """Feed chunks of text; get back the array elements completed by each chunk.
+
+    Tolerates markdown fences and a wrapping object ({"questions": [...]}): the
+    first '[' starts the array. Elements may be strings or objects; anything
+    that doesn't decode is skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def done(self):
+        """True once the array's closing bracket has been read."""
+        return self._done
+
+    def feed(self, chunk):
+        if self._done or not chunk:
+            return []
+        self._buffer += chunk
+        items = []
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            if not self._in_array:
+                if char == '[':
+                    self._in_array = True
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        items.append(self._take(self._pos + 1))
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 0:
+                    self._start = self._pos
+            elif char in '{[':
+                if self._depth == 0:
+                    self._start = self._pos
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 0:
+                    if char == ']':
+                        self._done = True
+                        self._pos += 1
+                        break
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        items.append(self._take(self._pos + 1))
+            self._pos += 1
+        # Keep only what an unfinished element still needs
+        keep_from = self._start if self._start is not None else self._pos
+        self._buffer = self._buffer[keep_from:]
+        self._pos -= keep_from
+        if self._start is not None:
+            self._start = 0
+        return [item for item in items if item is not None]
+
+    def _take(self, end):
+        text = self._buffer[self._start:end]
+        self._start = None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+
+def first_json_object(chunks):
+    """Join streamed chunks until the first top-level JSON object is complete and decode it.
+
+    Stops consuming the stream as soon as the object closes, so trailing text
+    (or a runaway generation) isn't waited for. Raises ValueError if the stream
+    ends without a complete object.
+    """
+    text = ''
+    start = None
+    depth = 0
+    in_string = escaped = False
+    for chunk in chunks:
+        offset = len(text)
+        text += chunk or ''
+        for index in range(offset, len(text)):
+            char = text[index]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = start is not None
+            elif char == '{':
+                if start is None:
+                    start = index
+                depth += 1
+            elif char == '}' and start is not None:
+                depth -= 1
+                if depth == 0:
+                    return json.loads(text[start:index + 1])
+    raise ValueError('stream ended before a complete JSON object')
+
+
+def sse(event, data):
+    """One Server-Sent Events frame carrying data as JSON."""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
@@ -1,32 +1,76 @@
 import os
-import json
-from datetime import datetime
 
-from app import app, db, send_email
-from app import Application, Job, Candidate
+from extensions import db
+from models import Application, Job, Candidate
+from mail import acceptance_email, send_email
+from cache import invalidate, admin_jobs_key
 
 # This module is imported by the RQ worker (run: `rq worker --url $REDIS_URL default`)
 # The worker must run in the same project where `app` and models are defined.
+# Only lightweight modules are imported here; the Flask app is built on the
+# first task call so forking a work-horse stays cheap.
+_app = None
+
+# One bulk invite run per job at a time: the enqueue endpoint holds this key
+# (value: the RQ job id) until the run finishes. The TTL outlives RQ's default
+# job timeout and frees the job if a work-horse dies without cleaning up.
+BULK_INVITE_LOCK_PREFIX = 'bulk_invites:lock:'
+BULK_INVITE_LOCK_TTL = 3600
+# Progress is written to the RQ job's meta every this many applications
+PROGRESS_EVERY = 10
+
+
+def get_app():
+    """Return the worker's Flask app, creating it on first use."""
+    global _app
+    if _app is None:
+        from app import create_app
+        _app = create_app()
+    return _app
+
 
 def send_bulk_invites(job_id):
     """Background job: send interview invites to all shortlisted candidates for a job.
 
     This function runs inside an RQ worker process. It uses the Flask app context
-    to access SQLAlchemy and the send_email() helper defined in `app.py`.
+    to access SQLAlchemy and the send_email() helper defined in `mail.py`.
+    Progress (total/sent/failed) is kept in the RQ job's meta for the status endpoint.
     """
-    with app.app_context():
+    from rq import get_current_job
+    from redis_client import get_redis
+
+    rq_job = get_current_job()
+    try:
+        return _send_bulk_invites(job_id, rq_job)
+    finally:
+        redis_conn = get_redis()
+        lock_key = f"{BULK_INVITE_LOCK_PREFIX}{job_id}"
+        # Only release the lock if this run still owns it
+        if redis_conn is not None and rq_job is not None and (redis_conn.get(lock_key) or b'').decode() == rq_job.id:
+            redis_conn.delete(lock_key)
+
+
+def _send_bulk_invites(job_id, rq_job):
+    with get_app().app_context():
         job = Job.query.get(job_id)
         if not job:
             print(f"send_bulk_invites: job {job_id} not found")
-            return {'status': 'error', 'reason': 'job_not_found'}
+            return {'status': 'error', 'reason': 'job_not_found', 'sent': 0, 'failed': 0, 'results': []}
 
         applications = Application.query.filter_by(job_id=job_id, status='Shortlisted').all()
+        progress = {'total': len(applications), 'sent': 0, 'failed': 0}
+
+        def report():
+            if rq_job is not None:
+                rq_job.meta['progress'] = dict(progress)
+                rq_job.save_meta()
+
+        report()
         results = []
-        for application in applications:
+        for number, application in enumerate(applications, start=1):
             try:
                 candidate = Candidate.query.get(application.candidate_id)
-                interview_link = app.test_request_context().push() or ''
-                # build interview link using url_for with _external disabled in worker
+                # build interview link from WEBAPP_URL; there is no request context in the worker
                 interview_link = f"{os.getenv('WEBAPP_URL','')}/interview/{application.id}"
                 subject = f"Interview Invitation for the {job.title} role"
                 body = (
@@ -40,8 +84,175 @@ def send_bulk_invites(job_id):
                 db.session.add(application)
                 db.session.commit()
                 results.append({'application_id': application.id, 'email': candidate.email, 'status': 'sent'})
+                progress['sent'] += 1
             except Exception as e:
+                db.session.rollback()
                 print(f"send_bulk_invites: failed to send to application {application.id}: {e}")
                 # keep going with other applications
-                results.append({'application_id': application.id, 'error': str(e)})
-        return {'status': 'completed', 'sent': len([r for r in results if r.get('status')=='sent']), 'results': results}
+                results.append({'application_id': application.id, 'status': 'failed', 'error': str(e)})
+                progress['failed'] += 1
+            if number % PROGRESS_EVERY == 0:
+                report()
+        report()
+        invalidate(admin_jobs_key(job.admin_id))
+        return {'status': 'completed', 'sent': progress['sent'], 'failed': progress['failed'], 'results': results}
+
+
+def send_status_notifications(notifications, company_name):
+    """Background job: email candidates accepted by a bulk status update.
+
+    notifications is a list of {'application_id', 'email', 'job_title'}; the
+    statuses are already committed, so a failed email doesn't undo a decision.
+    """
+    from rq import get_current_job
+
+    rq_job = get_current_job()
+    progress = {'total': len(notifications), 'sent': 0, 'failed': 0}
+
+    def report():
+        if rq_job is not None:
+            rq_job.meta['progress'] = dict(progress)
+            rq_job.save_meta()
+
+    results = []
+    with get_app().app_context():
+        report()
+        for number, item in enumerate(notifications, start=1):
+            try:
+                subject, html_body = acceptance_email(item['job_title'], company_name)
+                send_email(item['email'], subject, body=None, html_body=html_body)
+                results.append({'application_id': item['application_id'], 'email': item['email'], 'status': 'sent'})
+                progress['sent'] += 1
+            except Exception as e:
+                print(f"send_status_notifications: failed to email application {item['application_id']}: {e}")
+                results.append({'application_id': item['application_id'], 'email': item['email'],
+                                'status': 'failed', 'error': str(e)})
+                progress['failed'] += 1
+            if number % PROGRESS_EVERY == 0:
+                report()
+        report()
+    return {'status': 'completed', 'sent': progress['sent'], 'failed': progress['failed'], 'results': results}
+
+
+def archive_job(job_id):
+    """Background job: move a closed job's applications into the archive (see archive.py)."""
+    from rq import get_current_job
+    import archive
+
+    rq_job = get_current_job()
+
+    def report(archived, moved):
+        if rq_job is not None:
+            rq_job.meta['progress'] = {'archived': archived, 'reports_moved': moved}
+            rq_job.save_meta()
+
+    with get_app().app_context():
+        job = Job.query.get(job_id)
+        if not job:
+            print(f"archive_job: job {job_id} not found")
+            return {'status': 'error', 'reason': 'job_not_found'}
+        admin_id = job.admin_id
+        try:
+            archived, moved = archive.archive_job(job_id, progress=report)
+        except ValueError as e:
+            db.session.rollback()
+            return {'status': 'error', 'reason': str(e)}
+        invalidate(admin_jobs_key(admin_id))
+        return {'status': 'completed', 'archived': archived, 'reports_moved': moved}
+
+
+def regenerate_reports(job_id, rescore=False):
+    """Background job: rebuild a job's interview reports from their stored transcripts (see reports.py)."""
+    from rq import get_current_job
+    import reports
+
+    rq_job = get_current_job()
+
+    def report(done, total):
+        if rq_job is not None:
+            rq_job.meta['progress'] = {'done': done, 'total': total}
+            rq_job.save_meta()
+
+    with get_app().app_context():
+        summary = reports.regenerate_reports(job_id=job_id, rescore=rescore, progress=report)
+        return {'status': 'completed', **summary}
+
+
+def ingest_resumes(job_id, upload_key, filename, attach_registered=False):
+    """Background job: bulk-import resumes from an uploaded ZIP or CSV into a job.
+
+    The upload is read from Redis (stored by the ingest endpoint) and deleted
+    when the import finishes. Progress counters are kept in the RQ job's meta so the status
+    endpoint can report them while the import runs. Resumes whose email belongs to a
+    registered candidate are only added to that account with attach_registered, and are
+    listed in the result's registered_matches either way.
+    """
+    from rq import get_current_job
+    from redis_client import get_redis
+
+    rq_job = get_current_job()
+    progress = {'processed': 0, 'candidates_created': 0, 'applications_created': 0,
+                'skipped': 0, 'failed': 0, 'registered_matched': 0}
+    failures = []
+    registered_matches = []
+
+    def report():
+        if rq_job is not None:
+            rq_job.meta['progress'] = dict(progress)
+            rq_job.save_meta()
+
+    redis_conn = get_redis()
+    data = redis_conn.get(upload_key) if redis_conn is not None else None
+    if data is None:
+        print(f"ingest_resumes: upload {upload_key} missing or expired")
+        return {'status': 'error', 'reason': 'upload_expired'}
+
+    try:
+        return _ingest_upload(job_id, filename, data, attach_registered, report, progress, failures,
+                              registered_matches)
+    finally:
+        # Kept until the import ends so a crashed work-horse can be retried
+        redis_conn.delete(upload_key)
+
+
+def _ingest_upload(job_id, filename, data, attach_registered, report, progress, failures, registered_matches):
+    from ingest import iter_row_batches, insert_batch
+
+    with get_app().app_context():
+        job = Job.query.get(job_id)
+        if not job:
+            print(f"ingest_resumes: job {job_id} not found")
+            return {'status': 'error', 'reason': 'job_not_found'}
+        admin_id = job.admin_id
+        if job.status != 'open':
+            print(f"ingest_resumes: job {job_id} is {job.status}, not importing")
+            return {'status': 'error', 'reason': 'job_not_open'}
+        db.session.commit()
+
+        try:
+            for batch in iter_row_batches(filename, data):
+                rows = [row for row in batch if 'error' not in row]
+                for row in batch:
+                    if 'error' in row:
+                        failures.append({'source': row['source'], 'error': row['error']})
+                if rows:
+                    created_candidates, created_applications, skipped, registered = insert_batch(
+                        job_id, rows, attach_registered)
+                    progress['candidates_created'] += created_candidates
+                    progress['applications_created'] += created_applications
+                    progress['skipped'] += skipped
+                    registered_matches.extend(registered)
+                    progress['registered_matched'] = len(registered_matches)
+                progress['processed'] += len(batch)
+                progress['failed'] = len(failures)
+                report()
+        except Exception as e:
+            db.session.rollback()
+            print(f"ingest_resumes: import of {filename} for job {job_id} stopped: {e}")
+            invalidate(admin_jobs_key(admin_id))
+            return {'status': 'error', 'reason': str(e), **progress, 'failures': failures,
+                    'registered_matches': registered_matches, 'attach_registered': attach_registered}
+
+        invalidate(admin_jobs_key(admin_id))
+        return {'status': 'completed', **progress, 'failures': failures,
+                'registered_matches': registered_matches, 'attach_registered': attach_registered}